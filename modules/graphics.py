@@ -3,10 +3,32 @@ Módulo de Gráficos Interactivos (Plotly)
 Genera visualizaciones profesionales e interactivas para la aplicación.
 """
 
+import html
+import re
+from functools import lru_cache, wraps
+from itertools import chain
+from types import MappingProxyType
+import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
+import plotly.io as pio
 from typing import List, Dict, Optional, Tuple
 
+from modules.power45 import generar_curva_ideal_power45
+
+# Streamlit solo es necesario para mostrar resultados y cachear figuras; los
+# constructores de gráficos se pueden importar y usar sin él (scripts, tests, PDF)
+try:
+    import streamlit as st
+except ImportError:
+    st = None
+
+# Serialización JSON de figuras vía orjson (st.plotly_chart usa plotly.io.to_json).
+# Si orjson no está instalado se mantiene el encoder estándar.
+try:
+    pio.json.config.default_engine = "orjson"
+except ValueError:
+    pass
+
 # Colores corporativos y profesionales
 COLOR_PRIMARIO = '#1f77b4'  # Azul profesional
 COLOR_SECUNDARIO = '#ff7f0e'  # Naranja
@@ -15,6 +37,250 @@ COLOR_ADVERTENCIA = '#d62728' # Rojo
 COLOR_FONDO = '#ffffff'
 COLOR_GRILLA = '#e5e5e5'
 
+# Plantilla técnica común (estilo Excel: grilla negra, ejes espejados, leyenda enmarcada).
+# Se registra una sola vez; cada gráfico solo sobreescribe lo que le es propio.
+_TEMPLATE_TECNICO = go.layout.Template(pio.templates["plotly_white"])
+_TEMPLATE_TECNICO.layout.update(
+    title=dict(font=dict(size=20, family="Times New Roman", color="black")),
+    xaxis=dict(showgrid=True, gridcolor='black', linecolor='black', mirror=True,
+               title_font=dict(size=14, family="Arial Black")),
+    yaxis=dict(showgrid=True, gridcolor='black', linecolor='black', mirror=True,
+               title_font=dict(size=14, family="Arial Black")),
+    legend=dict(bordercolor="black", borderwidth=1, bgcolor="white")
+)
+pio.templates["concrete_mix"] = _TEMPLATE_TECNICO
+
+# Radio de búsqueda del hover y de las spikes (px). Acotarlos evita que plotly.js
+# recorra todos los puntos en cada movimiento del mouse (spikedistance=-1 = sin límite).
+_DISTANCIAS_HOVER = dict(hoverdistance=10, spikedistance=20)
+
+# Layouts base compartidos. Cada gráfico crea un dict nuevo con dict(base, ...) y solo
+# agrega lo propio. MappingProxyType protege solo el primer nivel: los sub-dicts (ejes,
+# leyenda) se comparten entre gráficos y no se modifican en el lugar (go.Figure los copia).
+_LAYOUT_TECNICO = MappingProxyType(dict(
+    template="concrete_mix",
+    width=800, height=500,
+    legend=dict(x=0.05, y=0.95),
+    **_DISTANCIAS_HOVER
+))
+_LAYOUT_SIMPLE = MappingProxyType(dict(
+    template="plotly_white",
+    hovermode="x unified",
+    **_DISTANCIAS_HOVER
+))
+_EJE_TAMIZ_VERTICAL = dict(title=dict(text="Sieve"), tickangle=-90)
+_EJE_TAMIZ = dict(title=dict(text="Tamiz"))
+_EJE_PASANTE = dict(title=dict(text="Percent Passing"), range=[0, 100])
+
+# Tamices estándar (2" a #200) usados para alinear límites por índice
+TAMICES_STD = ('2"', '1 1/2"', '1"', '3/4"', '1/2"', '3/8"', '#4', '#8', '#16', '#30', '#50', '#100', '#200')
+
+# Límites NSW (New South Wales RTA T306): tamiz -> (min, max)
+NSW_LIMITS = MappingProxyType({
+    '#200': (0, 7),
+    '#100': (5, 15),
+    '#50': (16, 30),
+    '#30': (22, 34),
+    '#16': (30, 42),
+    '#8': (38, 50),
+    '#4': (55, 75),
+    '3/8"': (75, 90),
+    '1/2"': (95, 100),
+    '3/4"': (100, 100),
+    '1"': (100, 100),
+    '1 1/2"': (100, 100),
+    '2"': (100, 100)
+})
+
+# Límites Illinois Tollway: tamiz -> (min, max)
+IL_LIMITS = MappingProxyType({
+    '#200': (0, 8),
+    '#100': (1, 12),
+    '#50': (5, 17),
+    '#30': (10, 25),
+    '#16': (18, 35),
+    '#8': (28, 45),
+    '#4': (40, 60),
+    '3/8"': (55, 77),
+    '1/2"': (65, 85),
+    '3/4"': (85, 98),
+    '1"': (100, 100),
+    '1 1/2"': (100, 100),
+    '2"': (100, 100)
+})
+
+# Límites ASTM C33 (Arena): tamiz -> (min, max)
+C33_LIMITS = MappingProxyType({
+    '3/8"': (100, 100),
+    '#4': (95, 100),
+    '#8': (80, 100),
+    '#16': (50, 85),
+    '#30': (25, 60),
+    '#50': (10, 30),
+    '#100': (2, 10),
+    '#200': (0, 0)
+})
+
+# Límites Tarantula (Forma "Castillo" extraída visualmente del Excel), alineados con TAMICES_STD
+# Upper: 2"->0, 1.5"->16, 1"->20, 3/4"->20, 1/2"->20, 3/8"->20, #4->20, #8->12, #16->12, #30->20, #50->20, #100->10, #200->0
+TARANTULA_SUP = np.array([0, 16, 20, 20, 20, 20, 20, 12, 12, 20, 20, 10, 0], dtype=np.int8)
+# Lower: 2"->0, ... 3/4"->0, 1/2"->4, 3/8"->4, #4->4, #8->0, #16->0, #30->4, #50->4, #100->0, #200->0
+TARANTULA_INF = np.array([0, 0, 0, 0, 4, 4, 4, 0, 0, 4, 4, 0, 0], dtype=np.int8)
+TARANTULA_SUP.flags.writeable = False
+TARANTULA_INF.flags.writeable = False
+
+# Tamices de las tablas de resultados (12 elementos según TAMICES_MM en config)
+_TAMICES_RESULTADOS = ('1.5"', '1"', '3/4"', '1/2"', '3/8"', '#4', '#8', '#16', '#30', '#50', '#100', '#200')
+
+
+@lru_cache(maxsize=256)
+def _norm_tamiz(tamiz: str) -> str:
+    """Normaliza el nombre de un tamiz para búsqueda ('Nº4' -> '#4', sin comillas)."""
+    return tamiz.replace('Nº', '#').strip().replace('"', '')
+
+
+# Tablas de límites indexadas por nombre normalizado (se calculan una sola vez)
+_NSW_LIMITS_NORM = {_norm_tamiz(k): v for k, v in NSW_LIMITS.items()}
+_IL_LIMITS_NORM = {_norm_tamiz(k): v for k, v in IL_LIMITS.items()}
+_C33_LIMITS_NORM = {_norm_tamiz(k): v for k, v in C33_LIMITS.items()}
+_IDX_TAMICES_STD = {_norm_tamiz(t): i for i, t in enumerate(TAMICES_STD)}
+
+
+@lru_cache(maxsize=32)
+def _limites_tarantula(tamices: Tuple[str, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Límites Tarantula (superior, inferior) alineados con una lista de tamices.
+    TARANTULA_SUP / TARANTULA_INF están indexados según TAMICES_STD; un tamiz que
+    no está en la lista estándar queda en 0. Los arreglos devueltos son de solo lectura.
+    
+    Args:
+        tamices: Tupla de nombres de tamices del gráfico
+    """
+    # Índice de cada tamiz en la lista estándar (sin comillas); -1 si no está
+    idx = np.fromiter((_IDX_TAMICES_STD.get(t, -1) for t in map(_norm_tamiz, tamices)),
+                      dtype=np.intp, count=len(tamices))
+    encontrado = idx >= 0
+    
+    y_sup = np.where(encontrado, TARANTULA_SUP[idx], 0).astype(np.int8)
+    y_inf = np.where(encontrado, TARANTULA_INF[idx], 0).astype(np.int8)
+    y_sup.flags.writeable = False
+    y_inf.flags.writeable = False
+    return y_sup, y_inf
+
+
+@lru_cache(maxsize=32)
+def _curva_ideal_power45(tmn: float) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    """
+    Curva ideal Power 45 (tamices, % ideales) para un TMN, cacheada entre reruns.
+    Se devuelven tuplas para que el resultado compartido no se pueda modificar.
+    """
+    tamices_mm, ideales = generar_curva_ideal_power45(tmn)
+    return tuple(tamices_mm), tuple(ideales)
+
+
+def _a_float32(valores) -> np.ndarray:
+    """
+    Convierte una curva a arreglo float32 contiguo.
+    Plotly (>= 6) serializa los ndarray como arreglos binarios base64 (4 bytes por valor)
+    en vez de escribir cada número como texto JSON; un arreglo contiguo se codifica
+    directamente desde su buffer (sin copia previa si ya es float32 contiguo).
+    """
+    return np.ascontiguousarray(valores, dtype=np.float32)
+
+def _figura(trazos: list, layout) -> go.Figure:
+    """
+    Construye la figura final a partir de trazas y layout en dicts planos.
+    go.Figure valida cada propiedad y resuelve el nombre de la plantilla.
+    
+    Args:
+        trazos: Lista de dicts de trazas (con clave 'type')
+        layout: Dict (o MappingProxyType) con el layout
+    """
+    return go.Figure(data=trazos, layout=dict(layout))
+
+def _eje_tamices(eje: dict, tamices_nombres: List[str]) -> dict:
+    """
+    Eje X de categorías con el orden fijo de los tamices.
+    Declarar el tipo evita que plotly.js lo infiera recorriendo el eje X de cada traza.
+    
+    Args:
+        eje: Dict base del eje (título, ángulo de las etiquetas)
+        tamices_nombres: Nombres de tamices en el orden a mostrar
+    """
+    return dict(eje, type='category', categoryorder='array', categoryarray=list(tamices_nombres))
+
+def _figura_cacheada(constructor):
+    """
+    Decorador para los constructores de gráficos.
+    El constructor devuelve (trazos, layout) en dicts planos; eso es lo que guarda
+    st.cache_data y la figura se arma con _figura en cada llamada (cada acierto de
+    caché entrega una figura nueva). Sin Streamlit la especificación se calcula en
+    cada llamada.
+    """
+    if st is None:
+        especificacion = constructor
+    else:
+        especificacion = st.cache_data(max_entries=32, show_spinner=False)(constructor)
+
+    @wraps(constructor)
+    def envoltura(*args, **kwargs) -> go.Figure:
+        return _figura(*especificacion(*args, **kwargs))
+    return envoltura
+
+def _metricas_html(metricas: List[Tuple[str, str]]) -> str:
+    """
+    Genera una franja de métricas (estilo st.metric) como un único bloque HTML.
+    Se renderiza con un solo st.markdown en lugar de st.columns + N st.metric.
+    Etiquetas y valores se escapan (se muestran como texto, no como HTML).
+    La etiqueta hereda el color del texto del tema (claro u oscuro) atenuado con opacidad.
+    
+    Args:
+        metricas: Lista de tuplas (etiqueta, valor formateado)
+    """
+    cajas = "".join(
+        f'<div style="min-width:0">'
+        f'<div style="font-size:0.875rem;color:inherit;opacity:0.6">{html.escape(str(etiqueta))}</div>'
+        f'<div style="font-size:2.25rem;line-height:1.2">{html.escape(str(valor))}</div>'
+        f'</div>'
+        for etiqueta, valor in metricas
+    )
+    # Grilla de columnas iguales (equivalente a st.columns(len(metricas)))
+    return (f'<div style="display:grid;grid-template-columns:repeat({len(metricas)},minmax(0,1fr));'
+            f'gap:1rem;margin-bottom:1rem">{cajas}</div>')
+
+# Metacaracteres Markdown dentro de una celda: '|' corta la columna, * _ ` ~ dan formato,
+# $ abre LaTeX en st.markdown, [ ] < > # enlaces/HTML/títulos. Se escapan con barra invertida
+_MARKDOWN_ESPECIALES = re.compile(r'([\\`*_~|$\[\]<>#])')
+
+def _celda_markdown(valor) -> str:
+    """Texto literal de una celda de tabla Markdown (None -> vacío, saltos de línea -> espacio)."""
+    if valor is None:
+        return ""
+    return _MARKDOWN_ESPECIALES.sub(r'\\\1', str(valor).replace("\n", " "))
+
+def _formato_numero(valor, decimales: int = 1) -> str:
+    """Número con decimales fijos para una celda de tabla (None o NaN -> vacío)."""
+    if valor is None or valor != valor:
+        return ""
+    return f"{valor:.{decimales}f}"
+
+def _tabla_markdown(columnas: Dict[str, list]) -> str:
+    """
+    Serializa una tabla pequeña (columna -> valores) como tabla Markdown estática.
+    Evita construir un DataFrame y montar la grilla interactiva de st.dataframe.
+    Encabezados y valores se escapan (_celda_markdown): se muestran tal cual.
+    
+    Args:
+        columnas: Diccionario con el nombre de cada columna y sus valores (misma longitud)
+    """
+    encabezado = "| " + " | ".join(map(_celda_markdown, columnas)) + " |"
+    separador = "|" + "---|" * len(columnas)
+    filas = (
+        "| " + " | ".join(map(_celda_markdown, fila)) + " |"
+        for fila in zip(*columnas.values())
+    )
+    return "\n".join(chain((encabezado, separador), filas))
+
 def mostrar_resultados_faury(resultados: Dict):
     """
     Muestra los resultados del diseño Faury-Joisel en formato tabular.
@@ -22,56 +288,116 @@ def mostrar_resultados_faury(resultados: Dict):
     Args:
         resultados: Diccionario con resultados del diseño
     """
-    import streamlit as st
-    import pandas as pd
-    
     st.markdown("### 📊 Resultados del Diseño Faury-Joisel")
     
     # Métricas principales
-    col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Cemento", f"{resultados['cemento']['cantidad']:.1f} kg/m³")
-    col2.metric("Agua", f"{resultados['agua_cemento']['agua_amasado']:.1f} L/m³")
-    col3.metric("A/C", f"{resultados['agua_cemento']['razon']:.3f}")
-    col4.metric("Aire", f"{resultados['aire']['volumen']:.1f} L/m³")
-    
-    # Tabla de cantidades
+    st.markdown(_metricas_html([
+        ("Cemento", f"{resultados['cemento']['cantidad']:.1f} kg/m³"),
+        ("Agua", f"{resultados['agua_cemento']['agua_amasado']:.1f} L/m³"),
+        ("A/C", f"{resultados['agua_cemento']['razon']:.3f}"),
+        ("Aire", f"{resultados['aire']['volumen']:.1f} L/m³")
+    ]), unsafe_allow_html=True)
+    
+    # Tabla de cantidades (tabla estática: sin pandas ni grilla interactiva)
     st.markdown("#### Cantidades de Materiales")
+    cantidades = resultados['cantidades_kg_m3']
     data_materiales = {
-        'Material': ['Cemento'] + list(resultados['cantidades_kg_m3'].keys()) + ['Agua Total', 'Aire'],
+        'Material': list(chain(('Cemento',), cantidades, ('Agua Total', 'Aire'))),
         'Cantidad': [
             f"{resultados['cemento']['cantidad']:.1f} kg",
-            *[f"{v:.1f} kg" for v in resultados['cantidades_kg_m3'].values()],
+            *[f"{v:.1f} kg" for v in cantidades.values()],
             f"{resultados['agua_cemento']['agua_total']:.1f} L",
             f"{resultados['aire']['volumen']:.1f} L"
         ]
     }
-    df_mat = pd.DataFrame(data_materiales)
-    st.dataframe(df_mat, use_container_width=True, hide_index=True)
+    st.markdown(_tabla_markdown(data_materiales))
     
     # Granulometría de la mezcla
     if 'granulometria_mezcla' in resultados and resultados['granulometria_mezcla']:
         st.markdown("#### Granulometría de la Mezcla")
-        # Usar la longitud real de la granulometría
+        # Usar la longitud real de la granulometría (acotada a los tamices conocidos)
         gran_data = resultados['granulometria_mezcla']
-        # Tamices estándar (12 elementos según TAMICES_MM en config)
-        tamices_std = ['1.5"', '1"', '3/4"', '1/2"', '3/8"', '#4', '#8', '#16', '#30', '#50', '#100', '#200']
-        
-        # Ajustar longitud si es necesario
-        tamices = tamices_std[:len(gran_data)]
+        n = min(len(gran_data), len(_TAMICES_RESULTADOS))
         
         # Obtener datos de banda si existen
         banda = resultados.get('banda_trabajo', [])
-        min_vals = [b[0] for b in banda[:len(tamices)]] if banda else [None]*len(tamices)
-        max_vals = [b[1] for b in banda[:len(tamices)]] if banda else [None]*len(tamices)
-        
-        df_gran = pd.DataFrame({
-            'Tamiz': tamices,
-            '% Pasante': gran_data[:len(tamices)],
-            'Límite Inf': min_vals,
-            'Límite Sup': max_vals
-        })
-        st.dataframe(df_gran, use_container_width=True, hide_index=True)
-
+        min_vals = max_vals = [None] * n
+        if banda:
+            try:
+                b = np.asarray(banda[:n], dtype=float)
+            except (TypeError, ValueError):
+                b = None  # Filas de distinto largo o valores no numéricos
+            # Solo una banda (tamiz, [min, max]) se separa por columnas; si no, se omite
+            if b is not None and b.ndim == 2 and b.shape[1] >= 2:
+                # Completar con None si la banda cubre menos tamices que la granulometría
+                relleno = [None] * (n - len(b))
+                min_vals, max_vals = b[:, 0].tolist() + relleno, b[:, 1].tolist() + relleno
+
+        data_gran = {
+            'Tamiz': _TAMICES_RESULTADOS[:n],
+            '% Pasante': [_formato_numero(v) for v in gran_data[:n]],
+            'Límite Inf': [_formato_numero(v) for v in min_vals],
+            'Límite Sup': [_formato_numero(v) for v in max_vals]
+        }
+        st.markdown(_tabla_markdown(data_gran))
+
+# --- Geometría estática del diagrama Shilstone ---
+# ESTILO TÉCNICO IDÉNTICO AL EXCEL (Coordenadas Exactas). Solo el punto de la mezcla
+# depende de (CF, Wadj); líneas, ejes y rótulos de zona se definen una vez al importar.
+# Las líneas del mismo grosor van en una sola traza, separadas por None (segmentos sin unir)
+_SHILSTONE_LINEAS = (
+    # Límites (grosor 3)
+    # Line 1 (Límite Superior) Excel: (100, 36) -> (35, 45)
+    # Line 2 (Límite Inferior) Excel: (100, 27) -> (85, 27) -> (15, 37) -> (0, 37)
+    dict(type='scatter',
+         x=[100, 35, None, 100, 85, 15, 0],
+         y=[36, 45, None, 27, 27, 37, 37],
+         mode="lines", line=dict(color="black", width=3), showlegend=False, hoverinfo="skip"),
+    
+    # Divisiones verticales (grosor 2)
+    # Line 3 (División Vertical Derecha - Zona V vs III) Excel: (75, 28.43) -> (75, 39.46)
+    # Nota: Conecta Límite Inferior con Límite Superior
+    # Line 4 (División Vertical Izquierda - Zona I vs II) Excel: (45, 32.71) -> (45, 43.62)
+    dict(type='scatter',
+         x=[75, 75, None, 45, 45],
+         y=[28.43, 39.46, None, 32.71, 43.62],
+         mode="lines", line=dict(color="black", width=2), showlegend=False, hoverinfo="skip")
+)
+
+# Textos Grandes de Zonas (Posiciones ajustadas visualmente al Excel)
+_SHILSTONE_ANOTACIONES = (
+    dict(x=87.5, y=30, text="I<br>Gap", showarrow=False, font=dict(size=16, color="black", family="Arial Black")),
+    dict(x=60, y=41, text="II", showarrow=False, font=dict(size=16, color="black", family="Arial Black")),
+    dict(x=10, y=41, text="III<br>Small Agg", showarrow=False, font=dict(size=14, color="black", family="Arial Black")),
+    dict(x=87.5, y=42, text="IV<br>Sandy", showarrow=False, font=dict(size=14, color="black", family="Arial Black")),
+    dict(x=30, y=24, text="V<br>Coarse", showarrow=False, font=dict(size=16, color="black", family="Arial Black"))
+)
+
+# Configuración del Layout TÉCNICO
+_SHILSTONE_LAYOUT = MappingProxyType(dict(
+    title=dict(text="Shilstone Chart", font=dict(size=24, color="black", family="Times New Roman")),
+    xaxis=dict(
+        title=dict(text="Coarseness Factor"),
+        range=[100, 0], # INVERTIDO
+        dtick=20,
+        gridcolor='black', gridwidth=1,
+        zeroline=False, showline=True, linecolor='black', linewidth=2, mirror=True
+    ),
+    yaxis=dict(
+        title=dict(text="Workability Factor"),
+        range=[20, 45],
+        dtick=5,
+        gridcolor='black', gridwidth=1,
+        zeroline=False, showline=True, linecolor='black', linewidth=2, mirror=True
+    ),
+    template="plotly_white",
+    width=700, height=500,
+    showlegend=False,
+    annotations=_SHILSTONE_ANOTACIONES,
+    **_DISTANCIAS_HOVER
+))
+
+@_figura_cacheada
 def crear_grafico_shilstone_interactivo(CF: float, Wadj: float, evaluacion: Dict) -> go.Figure:
     """
     Crea un gráfico interactivo de Shilstone usando Plotly.
@@ -84,140 +410,84 @@ def crear_grafico_shilstone_interactivo(CF: float, Wadj: float, evaluacion: Dict
     Returns:
         Objeto go.Figure de Plotly
     """
-    fig = go.Figure()
-
-    # --- ESTILO TÉCNICO IDÉNTICO AL EXCEL (Coordenadas Exactas) ---
-    
-    # Line 1 (Límite Superior)
-    # Excel: (100, 36) -> (35, 45)
-    fig.add_trace(go.Scatter(
-        x=[100, 35], y=[36, 45],
-        mode="lines", line=dict(color="black", width=3), showlegend=False, hoverinfo="skip"
-    ))
-    
-    # Line 2 (Límite Inferior)
-    # Excel: (100, 27) -> (85, 27) -> (15, 37) -> (0, 37)
-    fig.add_trace(go.Scatter(
-        x=[100, 85, 15, 0], y=[27, 27, 37, 37],
-        mode="lines", line=dict(color="black", width=3), showlegend=False, hoverinfo="skip"
-    ))
-    
-    # Line 3 (División Vertical Derecha - Zona V vs III)
-    # Excel: (75, 28.43) -> (75, 39.46)
-    # Nota: Conecta Límite Inferior con Límite Superior
-    fig.add_trace(go.Scatter(
-        x=[75, 75], y=[28.43, 39.46],
-        mode="lines", line=dict(color="black", width=2), showlegend=False, hoverinfo="skip"
-    ))
-    
-    # Line 4 (División Vertical Izquierda - Zona I vs II)
-    # Excel: (45, 32.71) -> (45, 43.62)
-    fig.add_trace(go.Scatter(
-        x=[45, 45], y=[32.71, 43.62],
-        mode="lines", line=dict(color="black", width=2), showlegend=False, hoverinfo="skip"
-    ))
-
-    # Punto de la Mezcla Actual
-    fig.add_trace(go.Scatter(
-        x=[CF], y=[Wadj],
+    # Punto de la Mezcla Actual (única traza dinámica)
+    punto = dict(
+        type='scatter', x=[CF], y=[Wadj],
         mode='markers',
         marker=dict(size=14, color='red', line=dict(width=1, color='black')),
         name='Tu Mezcla',
-        text=[f"CF: {CF:.1f}, Wadj: {Wadj:.1f}"],
-        hovertemplate="<b>%{text}</b><extra></extra>"
-    ))
-
-    # Configuración del Layout TÉCNICO
-    fig.update_layout(
-        title=dict(text="Shilstone Chart", font=dict(size=24, color="black", family="Times New Roman")),
-        xaxis=dict(
-            title="Coarseness Factor",
-            range=[100, 0], # INVERTIDO
-            dtick=20,
-            gridcolor='black', gridwidth=1,
-            zeroline=False, showline=True, linecolor='black', linewidth=2, mirror=True
-        ),
-        yaxis=dict(
-            title="Workability Factor",
-            range=[20, 45],
-            dtick=5,
-            gridcolor='black', gridwidth=1,
-            zeroline=False, showline=True, linecolor='black', linewidth=2, mirror=True
-        ),
-        template="plotly_white",
-        width=700, height=500,
-        showlegend=False
+        # El hover se formatea en el navegador a partir de x/y (sin texto armado en Python)
+        hovertemplate="<b>CF: %{x:.1f}, Wadj: %{y:.1f}</b><extra></extra>"
     )
     
-    # Textos Grandes de Zonas (Posiciones ajustadas visualmente al Excel)
-    fig.add_annotation(x=87.5, y=30, text="I<br>Gap", showarrow=False, font=dict(size=16, color="black", family="Arial Black"))
-    fig.add_annotation(x=60, y=41, text="II", showarrow=False, font=dict(size=16, color="black", family="Arial Black"))
-    fig.add_annotation(x=10, y=41, text="III<br>Small Agg", showarrow=False, font=dict(size=14, color="black", family="Arial Black"))
-    fig.add_annotation(x=87.5, y=42, text="IV<br>Sandy", showarrow=False, font=dict(size=14, color="black", family="Arial Black"))
-    fig.add_annotation(x=30, y=24, text="V<br>Coarse", showarrow=False, font=dict(size=16, color="black", family="Arial Black"))
-    
-    return fig
+    # go.Figure copia las definiciones base; las constantes del módulo no se modifican
+    return [*_SHILSTONE_LINEAS, punto], dict(_SHILSTONE_LAYOUT)
+
 
+# Layout fijo del gráfico Power 45 (por llamada solo cambian las marcas del eje X)
+_LAYOUT_POWER45 = MappingProxyType(dict(
+    _LAYOUT_TECNICO,
+    title=dict(text="Power 45"),
+    yaxis=dict(title=dict(text="% Passing"), range=[0, 100])
+))
 
+@_figura_cacheada
 def crear_grafico_power45_interactivo(tamices_nombres: List[str], 
                                       tamices_power: List[float], 
                                       ideal_vals: List[float], 
                                       real_vals: List[float],
                                       rmse: float) -> go.Figure:
-    fig = go.Figure()
-
-    # Curva Ideal (Verde en Excel)
-    fig.add_trace(go.Scatter(
-        x=tamices_power, y=ideal_vals,
-        mode='lines', name='Max Density',
-        line=dict(color='green', width=3),
-        hovertemplate='Ideal: %{y:.1f}%<extra></extra>'
-    ))
-
+    # Curvas como arreglos float32 (serialización binaria en vez de listas de texto)
+    tamices_power = _a_float32(tamices_power)
+    ideal_vals = _a_float32(ideal_vals)
+    real_vals = _a_float32(real_vals)
+    
     # Límites +- (Rojos en Excel) - Aproximación visual
     # Suelen ser +-5% aprox
-    fig.add_trace(go.Scatter(
-        x=tamices_power, y=[min(100, v+5) for v in ideal_vals],
-        mode='lines', line=dict(color='red', width=1, dash='solid'),
-        name='Limits', hoverinfo='skip'
-    ))
-    fig.add_trace(go.Scatter(
-        x=tamices_power, y=[max(0, v-5) for v in ideal_vals],
-        mode='lines', line=dict(color='red', width=1, dash='solid'),
-        showlegend=False, hoverinfo='skip'
-    ))
-
-    # Curva Real (Azul con X)
-    fig.add_trace(go.Scatter(
-        x=tamices_power, y=real_vals,
-        mode='lines+markers', name='Mixture',
-        line=dict(color='blue', width=3),
-        marker=dict(symbol='x', size=8, color='blue'),
-        hovertemplate='Real: %{y:.1f}%<extra></extra>'
-    ))
-
-    fig.update_layout(
-        title=dict(text="Power 45", font=dict(size=20, family="Times New Roman")),
+    lim_sup = np.clip(ideal_vals + 5.0, None, 100.0)
+    lim_inf = np.clip(ideal_vals - 5.0, 0.0, None)
+
+    trazos = [
+        # Curva Ideal (Verde en Excel)
+        dict(type='scatter', x=tamices_power, y=ideal_vals,
+             mode='lines', name='Max Density',
+             line=dict(color='green', width=3),
+             hovertemplate='Ideal: %{y:.1f}%<extra></extra>'),
+
+        # Límites +- (Rojos en Excel): una sola traza cerrada (superior ida, inferior vuelta)
+        dict(type='scatter',
+             x=np.concatenate((tamices_power, tamices_power[::-1])),
+             y=np.concatenate((lim_sup, lim_inf[::-1])),
+             mode='lines', fill='toself', fillcolor='rgba(255,0,0,0.05)',
+             line=dict(color='red', width=1, dash='solid'),
+             name='Limits', hoverinfo='skip'),
+
+        # Curva Real (Azul con X)
+        dict(type='scatter', x=tamices_power, y=real_vals,
+             mode='lines+markers', name='Mixture',
+             line=dict(color='blue', width=3),
+             marker=dict(symbol='x', size=8, color='blue'),
+             hovertemplate='Real: %{y:.1f}%<extra></extra>')
+    ]
+
+    layout = dict(
+        _LAYOUT_POWER45,
         xaxis=dict(
-            title="Sieve (^0.45)",
-            tickmode='array', tickvals=tamices_power, ticktext=tamices_nombres,
-            showgrid=True, gridcolor='black', linecolor='black', mirror=True
-        ),
-        yaxis=dict(
-            title="% Passing",
-            range=[0, 100],
-            showgrid=True, gridcolor='black', linecolor='black', mirror=True
-        ),
-        template="plotly_white",
-        width=800, height=500,
-        legend=dict(
-            x=0.05, y=0.95,
-            bordercolor="black", borderwidth=1, bgcolor="white"
+            title=dict(text="Sieve (^0.45)"),
+            tickmode='array', tickvals=tamices_power, ticktext=tamices_nombres
         )
     )
     
-    return fig
+    return trazos, layout
+
+# Layout fijo del gráfico NSW
+_LAYOUT_NSW = MappingProxyType(dict(
+    _LAYOUT_TECNICO,
+    title=dict(text="NSW"),
+    yaxis=_EJE_PASANTE
+))
 
+@_figura_cacheada
 def crear_grafico_nsw(tamices_nombres: List[str],
 
                       mezcla_combinada: List[float]) -> go.Figure:
@@ -237,78 +507,47 @@ def crear_grafico_nsw(tamices_nombres: List[str],
     1/2: 95-100
     3/4: 100-100
     """
-    fig = go.Figure()
-    
-    # Definición de límites NSW (Map key: tame_name -> (min, max))
-    nsw_limits = {
-        '#200': (0, 7),
-        '#100': (5, 15),
-        '#50': (16, 30),
-        '#30': (22, 34),
-        '#16': (30, 42),
-        '#8': (38, 50),
-        '#4': (55, 75),
-        '3/8"': (75, 90),
-        '1/2"': (95, 100),
-        '3/4"': (100, 100),
-        '1"': (100, 100),
-        '1 1/2"': (100, 100),
-        '2"': (100, 100)
-    }
-    
     y_low = []
     y_up = []
     
     # Alinear límites
-    for t in tamices_nombres:
-        t_clean = t.replace('Nº', '#').strip().replace('"', '')
-        
-        found = False
-        val = None
-        
-        for k, v in nsw_limits.items():
-             if k.replace('"', '') == t_clean:
-                 val = v
-                 found = True
-                 break
+    for t_clean in map(_norm_tamiz, tamices_nombres):
+        val = _NSW_LIMITS_NORM.get(t_clean)
         
-        if found:
+        if val is not None:
             y_low.append(val[0])
             y_up.append(val[1])
         else:
             if "200" in t_clean and "<" in t_clean: y_low.append(0); y_up.append(0)
             else: y_low.append(None); y_up.append(None)
 
-    # Plotear Límites
-    fig.add_trace(go.Scatter(
-        x=tamices_nombres, y=y_up, mode='lines', name='NSW Upper',
-        line=dict(color='red', width=2), connectgaps=True, hoverinfo='skip'
-    ))
-    fig.add_trace(go.Scatter(
-        x=tamices_nombres, y=y_low, mode='lines', name='NSW Lower',
-        line=dict(color='red', width=2), connectgaps=True, showlegend=False, hoverinfo='skip'
-    ))
-
-    # Curva Combinada
-    fig.add_trace(go.Scatter(
-        x=tamices_nombres, y=mezcla_combinada,
-        mode='lines+markers', name='Combined',
-        line=dict(color='blue', width=3),
-        marker=dict(symbol='x', size=8, color='blue'),
-        hovertemplate='Pasa: %{y:.1f}%<extra></extra>'
-    ))
-
-    fig.update_layout(
-        title=dict(text="NSW", font=dict(size=20, family="Times New Roman", color="black")),
-        xaxis=dict(title="Sieve", showgrid=True, gridcolor='black', linecolor='black', mirror=True, tickangle=-90, title_font=dict(size=14, family="Arial Black")),
-        yaxis=dict(title="Percent Passing", range=[0, 100], showgrid=True, gridcolor='black', linecolor='black', mirror=True, title_font=dict(size=14, family="Arial Black")),
-        template="plotly_white", width=800, height=500,
-        legend=dict(x=0.05, y=0.95, bordercolor="black", borderwidth=1, bgcolor="white")
-    )
-    
-    return fig
-
-
+    # Límites en float32 (los tamices sin norma quedan como NaN: connectgaps los salta)
+    trazos = [
+        # Plotear Límites
+        dict(type='scatter', x=tamices_nombres, y=_a_float32(y_up), mode='lines', name='NSW Upper',
+             line=dict(color='red', width=2), connectgaps=True, hoverinfo='skip'),
+        dict(type='scatter', x=tamices_nombres, y=_a_float32(y_low), mode='lines', name='NSW Lower',
+             line=dict(color='red', width=2), connectgaps=True, showlegend=False, hoverinfo='skip'),
+
+        # Curva Combinada
+        dict(type='scatter', x=tamices_nombres, y=_a_float32(mezcla_combinada),
+             mode='lines+markers', name='Combined',
+             line=dict(color='blue', width=3),
+             marker=dict(symbol='x', size=8, color='blue'),
+             hovertemplate='Pasa: %{y:.1f}%<extra></extra>')
+    ]
+
+    return trazos, dict(_LAYOUT_NSW, xaxis=_eje_tamices(_EJE_TAMIZ_VERTICAL, tamices_nombres))
+
+
+# Layout fijo del gráfico Illinois Tollway
+_LAYOUT_ILLINOIS = MappingProxyType(dict(
+    _LAYOUT_TECNICO,
+    title=dict(text="IL Tollway"),
+    yaxis=_EJE_PASANTE
+))
+
+@_figura_cacheada
 def crear_grafico_illinois(tamices_nombres: List[str],
                            mezcla_combinada: List[float]) -> go.Figure:
     """
@@ -330,42 +569,14 @@ def crear_grafico_illinois(tamices_nombres: List[str],
     1 1/2": 100-100
     2": 100-100
     """
-    fig = go.Figure()
-    
-    # Definición de límites Illinois (Map key: tame_name -> (min, max))
-    il_limits = {
-        '#200': (0, 8),
-        '#100': (1, 12),
-        '#50': (5, 17),
-        '#30': (10, 25),
-        '#16': (18, 35),
-        '#8': (28, 45),
-        '#4': (40, 60),
-        '3/8"': (55, 77),
-        '1/2"': (65, 85),
-        '3/4"': (85, 98),
-        '1"': (100, 100),
-        '1 1/2"': (100, 100),
-        '2"': (100, 100)
-    }
-    
     y_low = []
     y_up = []
     
     # Alinear límites
-    for t in tamices_nombres:
-        t_clean = t.replace('Nº', '#').strip().replace('"', '')
-        
-        found = False
-        val = None
-        
-        for k, v in il_limits.items():
-             if k.replace('"', '') == t_clean:
-                 val = v
-                 found = True
-                 break
+    for t_clean in map(_norm_tamiz, tamices_nombres):
+        val = _IL_LIMITS_NORM.get(t_clean)
         
-        if found:
+        if val is not None:
             y_low.append(val[0])
             y_up.append(val[1])
         else:
@@ -373,151 +584,37 @@ def crear_grafico_illinois(tamices_nombres: List[str],
              if "200" in t_clean and "<" in t_clean: y_low.append(0); y_up.append(0)
              else: y_low.append(None); y_up.append(None)
 
-    # Plotear Límites (Rojos Solidos)
-    fig.add_trace(go.Scatter(
-        x=tamices_nombres, y=y_up,
-        mode='lines', name='IL Upper',
-        line=dict(color='red', width=2),
-        connectgaps=True, hoverinfo='skip'
-    ))
-    fig.add_trace(go.Scatter(
-        x=tamices_nombres, y=y_low,
-        mode='lines', name='IL Lower',
-        line=dict(color='red', width=2),
-        connectgaps=True, showlegend=False, hoverinfo='skip'
-    ))
-
-    # Curva Combinada (Azul con X)
-    fig.add_trace(go.Scatter(
-        x=tamices_nombres, y=mezcla_combinada,
-        mode='lines+markers', name='Combined',
-        line=dict(color='blue', width=3),
-        marker=dict(symbol='x', size=8, color='blue'),
-        hovertemplate='Pasa: %{y:.1f}%<extra></extra>'
-    ))
-
-    fig.update_layout(
-        title=dict(text="IL Tollway", font=dict(size=20, family="Times New Roman", color="black")),
-        xaxis=dict(
-            title="Sieve",
-            showgrid=True, gridcolor='black', linecolor='black', mirror=True,
-            tickangle=-90,
-            title_font=dict(size=14, family="Arial Black")
-        ),
-        yaxis=dict(
-            title="Percent Passing",
-            range=[0, 100],
-            showgrid=True, gridcolor='black', linecolor='black', mirror=True,
-            title_font=dict(size=14, family="Arial Black")
-        ),
-        template="plotly_white",
-        width=800, height=500,
-        legend=dict(
-            x=0.05, y=0.95,
-            bordercolor="black", borderwidth=1, bgcolor="white"
-        )
-    )
-    
-    return fig
-
-def crear_grafico_tarantula_interactivo(tamices_nombres: List[str],
-                                        retenidos_vals: List[float],
-                                        tmn: float = 25.0) -> go.Figure:
-    """
-    Tarantula Style: % Retained Volumetric (Pixel-Perfect Calibration)
-    Based on User's Excel Screenshot.
-    """
-    fig = go.Figure()
-
-    # LÍMITES EXACTOS (Forma "Castillo" extraída visualmente del Excel)
-    # Mapeo por índice de tamiz estándar (2", 1.5", 1", 3/4", 1/2", 3/8", #4, #8, #16, #30, #50, #100, #200)
-    # Total 13 tamices típicos.
-    
-    # Upper Limit (Línea Azul Punteada Superior)
-    # 2"->0, 1.5"->16, 1"->20, 3/4"->20, 1/2"->20, 3/8"->20, #4->20, #8->12, #16->12, #30->20, #50->20, #100->10, #200->0
-    lim_sup_vals = [0, 16, 20, 20, 20, 20, 20, 12, 12, 20, 20, 10, 0]
-    
-    # Lower Limit (Línea Azul Punteada Inferior)
-    # 2"->0, ... 3/4"->0, 1/2"->4, 3/8"->4, #4->4, #8->0, #16->0, #30->4, #50->4, #100->0, #200->0
-    lim_inf_vals = [0, 0, 0, 0, 4, 4, 4, 0, 0, 4, 4, 0, 0]
-    
-    # Tamices Estándar para alinear (Ajustaremos a los que vengan en tamices_nombres)
-    tamices_std = ['2"', '1 1/2"', '1"', '3/4"', '1/2"', '3/8"', '#4', '#8', '#16', '#30', '#50', '#100', '#200']
-    
-    # Crear vectores de límites alineados con el input real
-    y_sup = []
-    y_inf = []
-    
-    for t in tamices_nombres:
-        # Normalizar nombre para busqueda
-        t_clean = t.replace('Nº', '#').strip()
-        idx = -1
-        
-        # Buscar en lista estándar
-        for i, std in enumerate(tamices_std):
-            if std == t_clean: # Coincidencia exacta
-                idx = i
-                break
-            if std.replace('"', '') == t_clean.replace('"', ''): # Intento sin comillas
-                idx = i
-                break
-                
-        if idx != -1:
-            y_sup.append(lim_sup_vals[idx])
-            y_inf.append(lim_inf_vals[idx])
-        else:
-            # Si no está en, default 0
-            y_sup.append(0)
-            y_inf.append(0)
-    
-    # Líneas Límite (Azul Punteado)
-    fig.add_trace(go.Scatter(
-        x=tamices_nombres, y=y_sup,
-        mode='lines', name='Upper Limit',
-        line=dict(color='blue', width=1, dash='dash'),
-        hoverinfo='skip'
-    ))
-    fig.add_trace(go.Scatter(
-        x=tamices_nombres, y=y_inf,
-        mode='lines', name='Lower Limit',
-        line=dict(color='blue', width=1, dash='dash'),
-        showlegend=False, hoverinfo='skip'
-    ))
-
-    # Curva Real (Roja con Diamantes)
-    fig.add_trace(go.Scatter(
-        x=tamices_nombres, y=retenidos_vals,
-        mode='lines+markers', name='Percent Retained, % vol',
-        line=dict(color='red', width=2),
-        marker=dict(symbol='diamond', size=7, color='cyan', line=dict(color='red', width=1)),
-        hovertemplate='Retenido: %{y:.1f}%<extra></extra>'
-    ))
-
-    # Layout Técnico
-    fig.update_layout(
-        title=dict(text="Tarantula", font=dict(size=20, family="Times New Roman", color="black")),
-        xaxis=dict(
-            title="Sieve",
-            showgrid=True, gridcolor='black', linecolor='black', mirror=True,
-            tickangle=-90,
-            title_font=dict(size=14, family="Arial Black")
-        ),
-        yaxis=dict(
-            title="Percent Retained, % vol",
-            range=[0, 25],
-            showgrid=True, gridcolor='black', linecolor='black', mirror=True,
-            title_font=dict(size=14, family="Arial Black")
-        ),
-        template="plotly_white",
-        width=800, height=450,
-        legend=dict(
-            x=0.01, y=0.99,
-            bordercolor="black", borderwidth=1, bgcolor="white"
-        )
-    )
-    
+    # Límites en float32 (los tamices sin norma quedan como NaN: connectgaps los salta)
+    trazos = [
+        # Plotear Límites (Rojos Solidos)
+        dict(type='scatter', x=tamices_nombres, y=_a_float32(y_up),
+             mode='lines', name='IL Upper',
+             line=dict(color='red', width=2),
+             connectgaps=True, hoverinfo='skip'),
+        dict(type='scatter', x=tamices_nombres, y=_a_float32(y_low),
+             mode='lines', name='IL Lower',
+             line=dict(color='red', width=2),
+             connectgaps=True, showlegend=False, hoverinfo='skip'),
+
+        # Curva Combinada (Azul con X)
+        dict(type='scatter', x=tamices_nombres, y=_a_float32(mezcla_combinada),
+             mode='lines+markers', name='Combined',
+             line=dict(color='blue', width=3),
+             marker=dict(symbol='x', size=8, color='blue'),
+             hovertemplate='Pasa: %{y:.1f}%<extra></extra>')
+    ]
+
+    return trazos, dict(_LAYOUT_ILLINOIS, xaxis=_eje_tamices(_EJE_TAMIZ_VERTICAL, tamices_nombres))
+
+# Layout Técnico fijo del gráfico Tarantula
+_LAYOUT_TARANTULA = MappingProxyType(dict(
+    _LAYOUT_TECNICO,
+    title=dict(text="Tarantula"),
+    yaxis=dict(title=dict(text="Percent Retained, % vol"), range=[0, 25]),
+    height=450,
+    legend=dict(x=0.01, y=0.99),
     # Anotación Explicativa (Cuadro de Texto)
-    fig.add_annotation(
+    annotations=(dict(
         x=0.8, y=0.95, xref="paper", yref="paper",
         text="Greater than 15% on the sum of<br>#8, #16 and #30<br>24-34% of fine sand (#30-200)",
         showarrow=False,
@@ -526,10 +623,49 @@ def crear_grafico_tarantula_interactivo(tamices_nombres: List[str],
         bordercolor="black",
         borderwidth=1,
         font=dict(size=10, color="black")
-    )
-    
-    return fig
+    ),)
+))
 
+@_figura_cacheada
+def crear_grafico_tarantula_interactivo(tamices_nombres: List[str],
+                                        retenidos_vals: List[float],
+                                        tmn: float = 25.0) -> go.Figure:
+    """
+    Tarantula Style: % Retained Volumetric (Pixel-Perfect Calibration)
+    Based on User's Excel Screenshot.
+    """
+    # LÍMITES EXACTOS alineados con tamices_nombres (cacheados por lista de tamices)
+    y_sup, y_inf = _limites_tarantula(tuple(tamices_nombres))
+    
+    trazos = [
+        # Líneas Límite (Azul Punteado): una sola traza cerrada (superior ida, inferior vuelta)
+        dict(type='scatter',
+             x=[*tamices_nombres, *tamices_nombres[::-1]],
+             y=np.concatenate((y_sup, y_inf[::-1])),
+             mode='lines', name='Limits',
+             fill='toself', fillcolor='rgba(0,0,255,0.05)',
+             line=dict(color='blue', width=1, dash='dash'),
+             hoverinfo='skip'),
+
+        # Curva Real (Roja con Diamantes)
+        dict(type='scatter', x=tamices_nombres, y=_a_float32(retenidos_vals),
+             mode='lines+markers', name='Percent Retained, % vol',
+             line=dict(color='red', width=2),
+             marker=dict(symbol='diamond', size=7, color='cyan', line=dict(color='red', width=1)),
+             hovertemplate='Retenido: %{y:.1f}%<extra></extra>')
+    ]
+
+    return trazos, dict(_LAYOUT_TARANTULA, xaxis=_eje_tamices(_EJE_TAMIZ_VERTICAL, tamices_nombres))
+
+# Layout fijo del gráfico de gradaciones individuales y combinada (límites C33)
+_LAYOUT_INDIVIDUAL_COMBINADO = MappingProxyType(dict(
+    _LAYOUT_TECNICO,
+    title=dict(text="Individual and Combined Gradations"),
+    yaxis=_EJE_PASANTE,
+    legend=dict(x=0.8, y=0.1)
+))
+
+@_figura_cacheada
 def crear_grafico_individual_combinado(tamices_nombres: List[str],
                                        aridos_data: List[dict],
                                        mezcla_combinada: List[float]) -> go.Figure:
@@ -541,57 +677,34 @@ def crear_grafico_individual_combinado(tamices_nombres: List[str],
         aridos_data: Lista de dicts con {'nombre': str, 'granulometria': list}
         mezcla_combinada: Curva final combinada
     """
-    fig = go.Figure()
-    
-    # 1. Límites ASTM C33 (Arena) - Según Excel usuario
-    # Tamices relevantes: 3/8, #4, #8, #16, #30, #50, #100
-    # Values: Lower=[100, 95, 80, 50, 25, 10, 2], Upper=[100, 100, 100, 85, 60, 30, 10]
-    
-    c33_limits = {
-        '3/8"': (100, 100),
-        '#4': (95, 100),
-        '#8': (80, 100),
-        '#16': (50, 85),
-        '#30': (25, 60),
-        '#50': (10, 30),
-        '#100': (2, 10),
-        '#200': (0, 0)
-    }
+    # 1. Límites ASTM C33 (Arena) - Según Excel usuario (ver C33_LIMITS)
     
     y_c33_low = []
     y_c33_up = []
     
     # Construir curva C33 alineada con tamices del gráfico
-    for t in tamices_nombres:
-        t_clean = t.replace('Nº', '#').strip().replace('"', '')
-        
+    for t_clean in map(_norm_tamiz, tamices_nombres):
         # Búsqueda soft
-        found = False
-        for k, v in c33_limits.items():
-            if k.replace('"', '') == t_clean:
-                y_c33_low.append(v[0])
-                y_c33_up.append(v[1])
-                found = True
-                break
-        
-        if not found:
+        v = _C33_LIMITS_NORM.get(t_clean)
+        if v is not None:
+            y_c33_low.append(v[0])
+            y_c33_up.append(v[1])
+        else:
             y_c33_low.append(None) # No plotear donde no hay norma
             y_c33_up.append(None)
 
-    # Plotear C33 Envelope
-    fig.add_trace(go.Scatter(
-        x=tamices_nombres, y=y_c33_up,
-        mode='lines', name='C33 Upper',
-        line=dict(color='blue', width=2),
-        connectgaps=True
-    ))
-    fig.add_trace(go.Scatter(
-        x=tamices_nombres, y=y_c33_low,
-        mode='lines', name='C33 Lower',
-        line=dict(color='blue', width=2),
-        connectgaps=True,
-        showlegend=False
-    ))
+    # Plotear C33 Envelope (float32; los tamices sin norma quedan como NaN)
+    trazos = [
+        dict(type='scatter', x=tamices_nombres, y=_a_float32(y_c33_up),
+             mode='lines', name='C33 Upper',
+             line=dict(color='blue', width=2),
+             connectgaps=True, hoverinfo='skip'),
+        dict(type='scatter', x=tamices_nombres, y=_a_float32(y_c33_low),
+             mode='lines', name='C33 Lower',
+             line=dict(color='blue', width=2),
+             connectgaps=True,
+             showlegend=False, hoverinfo='skip')
+    ]
 
     # 2. Curvas Individuales
     colors = ['gray', 'orange', 'brown', 'purple'] 
@@ -601,74 +714,54 @@ def crear_grafico_individual_combinado(tamices_nombres: List[str],
         color = 'red' if 'arena' in arido['nombre'].lower() or 'fine' in arido['nombre'].lower() else colors[i % len(colors)]
         name_clean = arido['nombre']
         
-        fig.add_trace(go.Scatter(
-            x=tamices_nombres, y=arido['granulometria'],
+        trazos.append(dict(
+            type='scatter', x=tamices_nombres, y=_a_float32(arido['granulometria']),
             mode='lines+markers', name=name_clean,
             line=dict(width=1, color=color),
             marker=dict(symbol=markers[i % len(markers)], size=6)
         ))
 
     # 3. Curva Combinada
-    fig.add_trace(go.Scatter(
-        x=tamices_nombres, y=mezcla_combinada,
+    trazos.append(dict(
+        type='scatter', x=tamices_nombres, y=_a_float32(mezcla_combinada),
         mode='lines+markers', name='Combined',
         line=dict(color='magenta', width=3),
         marker=dict(symbol='circle', size=8, color='magenta')
     ))
 
-    fig.update_layout(
-        title=dict(text="Individual and Combined Gradations", font=dict(size=20, family="Times New Roman", color="black")),
-        xaxis=dict(
-            title="Sieve",
-            showgrid=True, gridcolor='black', linecolor='black', mirror=True,
-            tickangle=-90,
-            title_font=dict(size=14, family="Arial Black")
-        ),
-        yaxis=dict(
-            title="Percent Passing",
-            range=[0, 100],
-            showgrid=True, gridcolor='black', linecolor='black', mirror=True,
-            title_font=dict(size=14, family="Arial Black")
-        ),
-        template="plotly_white",
-        width=800, height=500,
-        legend=dict(
-            x=0.8, y=0.1,
-            bordercolor="black", borderwidth=1, bgcolor="white"
-        )
-    )
-    
-    return fig
+    # Una sola construcción: trazas y layout se validan una vez
+    return trazos, dict(_LAYOUT_INDIVIDUAL_COMBINADO, xaxis=_eje_tamices(_EJE_TAMIZ_VERTICAL, tamices_nombres))
+
+# Layout fijo del gráfico Haystack
+_LAYOUT_HAYSTACK = MappingProxyType(dict(
+    _LAYOUT_SIMPLE,
+    title=dict(text="Curva Haystack (% Retenido)", font=dict(size=20)),
+    yaxis=dict(title=dict(text="% Retenido"), range=[0, 30])
+))
 
+@_figura_cacheada
 def crear_grafico_haystack_interactivo(tamices_nombres: List[str],
                                        retenidos_vals: List[float]) -> go.Figure:
     """
     Crea gráfico Haystack (% Retenido).
     Similar a Tarantula pero con enfoque en banda de trabajo.
     """
-    fig = go.Figure()
-    
     # Límites Haystack (Ejemplo visual: picos en el centro)
     # Esto es ilustrativo, los límites reales dependen de la norma
     
-    fig.add_trace(go.Scatter(
+    trazos = [dict(
+        type='scatter',
         x=tamices_nombres,
-        y=retenidos_vals,
+        y=_a_float32(retenidos_vals),
         mode='lines+markers',
         name='Tu Mezcla',
         line=dict(color=COLOR_SECUNDARIO, width=3),
         marker=dict(size=8, symbol='diamond')
-    ))
+    )]
 
-    fig.update_layout(
-        title=dict(text="Curva Haystack (% Retenido)", font=dict(size=20)),
-        xaxis=dict(title="Tamiz"),
-        yaxis=dict(title="% Retenido", range=[0, 30]),
-        template="plotly_white",
-        hovermode="x unified"
-    )
-    return fig
+    return trazos, dict(_LAYOUT_HAYSTACK, xaxis=_eje_tamices(_EJE_TAMIZ, tamices_nombres))
 
+@_figura_cacheada
 def crear_grafico_gradaciones_individuales(tamices_nombres: List[str],
                                            aridos: List[Dict],
                                            proporciones: List[float],
@@ -676,107 +769,130 @@ def crear_grafico_gradaciones_individuales(tamices_nombres: List[str],
     """
     Crea gráfico con todas las curvas individuales y la combinada.
     """
-    fig = go.Figure()
-    
     # Curvas individuales
-    for i, arido in enumerate(aridos):
-        if i < len(proporciones):
-            nombre = f"{arido['nombre']} ({proporciones[i]:.1f}%)"
-            fig.add_trace(go.Scatter(
-                x=tamices_nombres,
-                y=arido['granulometria'],
-                mode='lines',
-                name=nombre,
-                line=dict(width=2, dash='dot'),
-                opacity=0.7
-            ))
+    trazos = [
+        dict(
+            type='scatter',
+            x=tamices_nombres,
+            y=_a_float32(arido['granulometria']),
+            mode='lines',
+            name=f"{arido['nombre']} ({prop:.1f}%)",
+            line=dict(width=2, dash='dot'),
+            opacity=0.7
+        )
+        for arido, prop in zip(aridos, proporciones)
+    ]
             
     # Curva Combinada
-    fig.add_trace(go.Scatter(
+    trazos.append(dict(
+        type='scatter',
         x=tamices_nombres,
-        y=mezcla_final,
+        y=_a_float32(mezcla_final),
         mode='lines+markers',
         name='Mezcla Combinada',
         line=dict(color='black', width=4),
         marker=dict(size=6, color='black')
     ))
 
-    fig.update_layout(
+    layout = dict(
+        _LAYOUT_SIMPLE,
         title=dict(text="Gradaciones Individuales y Combinada", font=dict(size=20)),
-        xaxis=dict(title="Tamiz", type='category'), # Category para mantener orden
-        yaxis=dict(title="% Que Pasa", range=[0, 105]),
-        template="plotly_white",
-        hovermode="x unified"
+        # Eje de categorías con el orden de los tamices
+        xaxis=_eje_tamices(_EJE_TAMIZ, tamices_nombres),
+        yaxis=dict(title=dict(text="% Que Pasa"), range=[0, 105])
     )
-    return fig
+    return trazos, layout
 
-def mostrar_resultados_optimizacion(resultado: Dict, granulometrias: List[List[float]], tmn: float):
+@_figura_cacheada
+def _crear_grafico_comparacion_power45(curva_ideal: List[float],
+                                       mezcla_opt: List[float]) -> go.Figure:
     """
-    Muestra los resultados de la optimización con gráficos interactivos.
-    
-    Args:
-        resultado: Diccionario con resultados de optimización
-        granulometrias: Lista de granulometrías de áridos
-        tmn: Tamaño máximo nominal
+    Gráfico de comparación entre la curva ideal Power 45 y la mezcla optimizada.
     """
-    import streamlit as st
-    from modules.power45 import generar_curva_ideal_power45
-    
-    st.markdown("### 🎯 Resultados de Optimización")
-    
-    # Métricas
-    col1, col2, col3 = st.columns(3)
-    col1.metric("Error Power45", f"{resultado.get('error_power45', 0):.3f}")
-    col2.metric("Penalización Total", f"{resultado.get('penalizacion_total', 0):.3f}")
-    col3.metric("Objetivo Final", f"{resultado.get('objetivo', 0):.3f}")
-    
-    # Proporciones óptimas
-    st.markdown("#### Proporciones Óptimas")
-    props = resultado.get('proporciones', [])
-    for i, prop in enumerate(props):
-        st.write(f"**Árido {i+1}:** {prop:.2f}%")
-    
-    # Gráfico de comparación con Power45
-    curva_ideal, tamices_mm = generar_curva_ideal_power45(tmn)
-    mezcla_opt = resultado.get('mezcla_optimizada', [])
-    
     # Tamices estándar (12 elementos)
-    tamices_nombres = ['1.5"', '1"', '3/4"', '1/2"', '3/8"', '#4', '#8', '#16', '#30', '#50', '#100', '#200']
+    tamices_nombres = _TAMICES_RESULTADOS
     
     # Ajustar longitudes para que coincidan
-    min_len = min(len(tamices_nombres), len(curva_ideal), len(mezcla_opt)) if mezcla_opt else min(len(tamices_nombres), len(curva_ideal))
+    min_len = min(len(tamices_nombres), len(curva_ideal), len(mezcla_opt))
     
-    fig = go.Figure()
+    # Posiciones enteras con etiquetas de tamiz (en lugar de un eje de categorías).
+    # Con hovermode "x unified" el encabezado del hover toma la etiqueta de ticktext,
+    # así que las trazas no repiten los nombres de tamiz (text/customdata)
+    posiciones = np.arange(min_len, dtype=np.int16)
+    etiquetas = list(tamices_nombres[:min_len])
     
     # Curva ideal Power45
-    fig.add_trace(go.Scatter(
-        x=tamices_nombres[:min_len],
-        y=curva_ideal[:min_len],
+    trazos = [dict(
+        type='scatter',
+        x=posiciones,
+        y=_a_float32(curva_ideal[:min_len]),
+        hovertemplate='%{y:.1f}%',
         mode='lines',
         name='Curva Ideal (Power 45)',
         line=dict(color=COLOR_BUENO, width=3, dash='dash')
-    ))
+    )]
     
     # Mezcla optimizada
     if mezcla_opt:
-        fig.add_trace(go.Scatter(
-            x=tamices_nombres[:min_len],
-            y=mezcla_opt[:min_len],
+        trazos.append(dict(
+            type='scatter',
+            x=posiciones,
+            y=_a_float32(mezcla_opt[:min_len]),
+            hovertemplate='%{y:.1f}%',
             mode='lines+markers',
             name='Mezcla Optimizada',
             line=dict(color=COLOR_PRIMARIO, width=3),
             marker=dict(size=8)
         ))
     
-    fig.update_layout(
-        title="Comparación con Curva Ideal Power 45",
-        xaxis=dict(title="Tamiz", type='category'),
-        yaxis=dict(title="% Que Pasa", range=[0, 105]),
-        template="plotly_white",
-        hovermode="x unified"
+    layout = dict(
+        _LAYOUT_SIMPLE,
+        title=dict(text="Comparación con Curva Ideal Power 45"),
+        xaxis=dict(title=dict(text="Tamiz"), tickmode='array',
+                   tickvals=posiciones, ticktext=etiquetas),
+        yaxis=dict(title=dict(text="% Que Pasa"), range=[0, 105])
     )
+    return trazos, layout
+
+def mostrar_resultados_optimizacion(resultado: Dict, granulometrias: List[List[float]], tmn: float):
+    """
+    Muestra los resultados de la optimización con gráficos interactivos.
+    
+    Args:
+        resultado: Diccionario con resultados de optimización
+        granulometrias: Lista de granulometrías de áridos
+        tmn: Tamaño máximo nominal
+    """
+    st.markdown("### 🎯 Resultados de Optimización")
     
-    st.plotly_chart(fig, use_container_width=True)
+    # Métricas
+    st.markdown(_metricas_html([
+        ("Error Power45", f"{resultado.get('error_power45', 0):.3f}"),
+        ("Penalización Total", f"{resultado.get('penalizacion_total', 0):.3f}"),
+        ("Objetivo Final", f"{resultado.get('objetivo', 0):.3f}")
+    ]), unsafe_allow_html=True)
+    
+    # Proporciones óptimas
+    st.markdown("#### Proporciones Óptimas")
+    props = resultado.get('proporciones', [])
+    # Una sola tabla estática en vez de un st.write por árido
+    if props:
+        st.markdown(_tabla_markdown({
+            'Árido': [f"Árido {i+1}" for i in range(len(props))],
+            'Proporción (%)': [f"{prop:.2f}" for prop in props]
+        }))
+    
+    # Gráfico de comparación con Power45 (solo si hay mezcla que comparar)
+    mezcla_opt = resultado.get('mezcla_optimizada', [])
+    if mezcla_opt:
+        tamices_mm, curva_ideal = _curva_ideal_power45(tmn)
+        
+        # Trazas cacheadas por st.cache_data: no se recalculan si las curvas no cambiaron
+        fig = _crear_grafico_comparacion_power45(curva_ideal, mezcla_opt)
+        
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("No hay mezcla optimizada.")
     
     # Evaluación de restricciones
     if 'evaluacion_restricciones' in resultado:
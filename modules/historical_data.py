@@ -1,4 +1,5 @@
 
+import re
 import pandas as pd
 import streamlit as st
 import numpy as np
@@ -11,6 +12,20 @@ SHEET_RESISTENCIA = "Resistencia"
 SHEET_CEMENTOS = "Cat_Cementos" # Ojo: validar nombre real si es distinto al catalogo
 SHEET_ARIDOS = "Cat_Aridos"     # Ojo: validar nombre real si es distinto al catalogo
 
+# Formato de las fechas en las planillas (dd/mm/aaaa). Explícito: sin él pandas deduce el
+# formato del primer valor y una fecha como 03/04/2024 se leería como mes/día
+FORMATO_FECHA = "%d/%m/%Y"
+
+# Formatos que se prueban en orden sobre las fechas que aún no se pudieron leer:
+# dd/mm/aaaa (una hora a continuación se ignora), ISO aaaa-mm-dd (lo que escribe
+# modules/database.py) y el resto (dd-mm-aa, d/m/aa...) con el día primero.
+# ISO va antes que dayfirst: con dayfirst=True pandas lee 2024-01-05 como 1 de mayo.
+_FORMATOS_FECHA = (
+    dict(format=FORMATO_FECHA, exact=False),
+    dict(format='ISO8601'),
+    dict(format='mixed', dayfirst=True)
+)
+
 # Mapeo de columnas para normalizar (Header Excel -> Header Interno)
 MAP_DOSIFICACIONES = {
     'Código': 'codigo',
@@ -90,6 +105,77 @@ MAP_ARIDOS = {
     'N°100 (0.160mm)': 't_0_16mm'
 }
 
+# Sufijo decimal ".0" de números leídos como float (ej "30.0" -> "30"); se compila una vez
+_CERO_DECIMAL = re.compile(r'\.0$')
+
+def _limpiar_num(serie):
+    """Convierte una columna numérica a texto sin el sufijo '.0' de los enteros."""
+    return serie.astype(str).str.replace(_CERO_DECIMAL, '', regex=True).str.strip()
+
+def _en_rango_fechas(fechas, desde, hasta):
+    """
+    Máscara de fechas (datetime64) dentro de [desde, hasta], ambos días incluidos.
+    NaT queda fuera del rango.
+    """
+    return (fechas >= pd.Timestamp(desde)) & (fechas < pd.Timestamp(hasta) + pd.Timedelta(days=1))
+
+def _a_fecha(ts):
+    """Timestamp -> date para mostrar (NaT -> None)."""
+    return None if pd.isna(ts) else ts.date()
+
+def _clave_mix(df):
+    """Clave de clase de hormigón: GRADO_JOIN + FD + TMN + DOCILIDAD, separados por '_'."""
+    return df['grado_join'].str.cat(
+        [_limpiar_num(df[col]) for col in ('fraccion_defectuosa', 'tmn', 'docilidad')],
+        sep='_'
+    )
+
+def _parsear_fechas(serie):
+    """
+    Columna de fechas de la planilla -> datetime64 a medianoche.
+    Cada formato de _FORMATOS_FECHA se aplica solo a lo que quedó sin leer; si aun así
+    quedan celdas no vacías sin fecha (NaT) se avisa con st.warning.
+    
+    Args:
+        serie: Columna tal como viene de Google Sheets (texto)
+    """
+    vacia = serie.isna() | serie.astype(str).str.strip().eq('')
+    fechas = pd.to_datetime(serie, errors='coerce', **_FORMATOS_FECHA[0])
+    for formato in _FORMATOS_FECHA[1:]:
+        pendientes = fechas.isna() & ~vacia
+        if not pendientes.any():
+            break
+        fechas = fechas.fillna(pd.to_datetime(serie[pendientes].astype(str), errors='coerce', **formato))
+    
+    sin_leer = int((fechas.isna() & ~vacia).sum())
+    if sin_leer:
+        st.warning(f"{sin_leer} fecha(s) de '{serie.name}' no se pudieron leer y quedan vacías.")
+    return fechas.dt.normalize()
+
+def _normalizar(df, mapa, cols_num=(), cols_texto=(), cols_fecha=()):
+    """
+    Limpieza común de las planillas: una sola pasada por tipo de columna.
+    Solo se procesan las columnas presentes en la hoja.
+    
+    Args:
+        df: DataFrame leído de Google Sheets
+        mapa: Mapeo de columnas (Header Excel -> Header Interno)
+        cols_num: Columnas numéricas (coma decimal, ver limpiar_decimales)
+        cols_texto: Strings clave (strip + mayúsculas)
+        cols_fecha: Fechas (ver _parsear_fechas). Quedan en datetime64 a medianoche: se
+            comparan vectorizadas, sin objetos date; las páginas las muestran como fecha
+            con column_config.DateColumn
+    """
+    # 1. Renombrar columnas
+    df = df.rename(columns=mapa)
+    # 2. Numéricos
+    df = limpiar_decimales(df, [c for c in cols_num if c in df.columns])
+    # 3. Strings clave y fechas (assign: un solo DataFrame nuevo)
+    return df.assign(
+        **{c: df[c].astype(str).str.strip().str.upper() for c in cols_texto if c in df.columns},
+        **{c: _parsear_fechas(df[c]) for c in cols_fecha if c in df.columns}
+    )
+
 def obtener_conexion():
     return st.connection("gsheets", type=GSheetsConnection)
 
@@ -101,20 +187,10 @@ def cargar_dosificaciones():
         # Usamos usecols o simplemente leemos todo y filtramos
         df = conn.read(worksheet=SHEET_DOSIFICACIONES, ttl=0)
         
-        # 1. Renombrar columnas
-        df.rename(columns=MAP_DOSIFICACIONES, inplace=True)
-        
-        # 2. Convertir columnas numéricas (comma decimal)
-        # Identificar columnas que deberían ser numéricas
+        # Columnas que deberían ser numéricas (comma decimal)
         cols_num = ['cemento_kg', 'agua_lt', 'tmn'] + [v for k,v in MAP_DOSIFICACIONES.items() if 'grava' in v or 'arena' in v or 'rodado' in v]
-        df = limpiar_decimales(df, cols_num)
-        
-        # 3. Limpieza de strings clave
-        for col in ['grado', 'docilidad', 'codigo']:
-            if col in df.columns:
-                df[col] = df[col].astype(str).str.strip().str.upper()
-                
-        return df
+        return _normalizar(df, MAP_DOSIFICACIONES, cols_num=cols_num,
+                           cols_texto=['grado', 'docilidad', 'codigo'])
     except Exception as e:
         st.error(f"Error cargando Dosificaciones: {e}")
         return pd.DataFrame()
@@ -126,24 +202,10 @@ def cargar_resistencias():
         conn = obtener_conexion()
         df = conn.read(worksheet=SHEET_RESISTENCIA, ttl=0)
         
-        # 1. Renombrar
-        df.rename(columns=MAP_RESISTENCIA, inplace=True)
-        
-        # 2. Limpieza numéricos
-        cols_num = ['resistencia_mpa', 'densidad_kgm3', 'tmn']
-        df = limpiar_decimales(df, cols_num)
-        
-        # 3. Fechas
-        for col_fecha in ['fecha_confeccion', 'fecha_ensayo']:
-            if col_fecha in df.columns:
-                df[col_fecha] = pd.to_datetime(df[col_fecha], errors='coerce').dt.date
-                
-        # 4. Limpieza strings clave
-        for col in ['grado', 'docilidad']:
-            if col in df.columns:
-                df[col] = df[col].astype(str).str.strip().str.upper()
-                
-        return df
+        return _normalizar(df, MAP_RESISTENCIA,
+                           cols_num=['resistencia_mpa', 'densidad_kgm3', 'tmn'],
+                           cols_texto=['grado', 'docilidad'],
+                           cols_fecha=['fecha_confeccion', 'fecha_ensayo'])
     except Exception as e:
         st.error(f"Error cargando Resistencias: {e}")
         return pd.DataFrame()
@@ -155,22 +217,10 @@ def cargar_cementos_historico():
         conn = obtener_conexion()
         df = conn.read(worksheet=SHEET_CEMENTOS, ttl=0)
         
-        # 1. Renombrar
-        df.rename(columns=MAP_CEMENTOS, inplace=True)
-        
-        # 2. Limpieza numéricos
-        # Detectar columnas que mapeamos a algo numerico
+        # Columnas que mapeamos a algo numérico
         cols_num = ['densidad_t_m3', 'compresion_7d', 'compresion_28d', 
                    'blaine', 'agua_normal_pct', 'perdida_calcinacion']
-         # (Asegurarnos que existen antes de limpiar)
-        cols_limpiar = [c for c in cols_num if c in df.columns]
-        df = limpiar_decimales(df, cols_limpiar)
-        
-        # 3. Fechas
-        if 'fecha_muestreo' in df.columns:
-            df['fecha_muestreo'] = pd.to_datetime(df['fecha_muestreo'], errors='coerce').dt.date
-            
-        return df
+        return _normalizar(df, MAP_CEMENTOS, cols_num=cols_num, cols_fecha=['fecha_muestreo'])
     except Exception as e:
         st.error(f"Error cargando Cementos: {e}")
         return pd.DataFrame()
@@ -182,23 +232,12 @@ def cargar_aridos_historico():
         conn = obtener_conexion()
         df = conn.read(worksheet=SHEET_ARIDOS, ttl=0)
         
-        # 1. Renombrar
-        df.rename(columns=MAP_ARIDOS, inplace=True)
-        
-        # 2. Limpieza numéricos
         cols_num = ['drs', 'drsss', 'absorcion', 'finos_p200', 'modulo_finura']
         # Agregar los tamices
         tamices = [v for k,v in MAP_ARIDOS.items() if k.startswith('1') or k.startswith('3') or 'mm' in k]
         cols_num.extend(tamices)
         
-        cols_limpiar = [c for c in cols_num if c in df.columns]
-        df = limpiar_decimales(df, cols_limpiar)
-        
-        # 3. Fechas
-        if 'fecha_muestreo' in df.columns:
-            df['fecha_muestreo'] = pd.to_datetime(df['fecha_muestreo'], errors='coerce').dt.date
-            
-        return df
+        return _normalizar(df, MAP_ARIDOS, cols_num=cols_num, cols_fecha=['fecha_muestreo'])
     except Exception as e:
         st.error(f"Error cargando Áridos: {e}")
         return pd.DataFrame()
@@ -218,6 +257,8 @@ def unir_dosificacion_resistencia(df_dos, df_res, filtro_edad=None, fecha_inicio
         
     # --- FILTRADO PREVIO (EDAD Y PERIODO) ---
     # Filtrar df_res antes de agrupar para que los promedios reflejen la selección
+    # Ambos filtros se combinan en una sola máscara y df_res se filtra una sola vez
+    mask = np.ones(len(df_res), dtype=bool)
     
     # 1. Filtro de Edad
     if filtro_edad:
@@ -225,21 +266,21 @@ def unir_dosificacion_resistencia(df_dos, df_res, filtro_edad=None, fecha_inicio
         if 'edad_dias' in df_res.columns:
             # Convertir a numeric, ignorar errores
             s_edad = pd.to_numeric(df_res['edad_dias'], errors='coerce')
-            # Filtrar
             # Convertir filtro_edad a int por si vienen strings
             edades_validas = [int(e) for e in filtro_edad]
-            df_res = df_res[s_edad.isin(edades_validas)]
+            mask &= s_edad.isin(edades_validas).to_numpy()
             
     # 2. Filtro de Fechas (Periodo)
     if fecha_inicio and fecha_fin:
         # Filtrar por Fecha de Confección como solicitó el usuario
         campo_fecha = 'fecha_confeccion'
         if campo_fecha in df_res.columns:
-            df_res[campo_fecha] = pd.to_datetime(df_res[campo_fecha], errors='coerce')
+            fechas = pd.to_datetime(df_res[campo_fecha], errors='coerce')
             # Filtrar rango
-            mask_fecha = (df_res[campo_fecha].dt.date >= fecha_inicio) & \
-                         (df_res[campo_fecha].dt.date <= fecha_fin)
-            df_res = df_res[mask_fecha]
+            mask &= _en_rango_fechas(fechas, fecha_inicio, fecha_fin).to_numpy()
+    
+    if not mask.all():
+        df_res = df_res[mask]
             
     if df_res.empty:
          # Si el filtro dejó vacío el historial de resistencias, y usamos INNER JOIN más adelante,
@@ -256,74 +297,94 @@ def unir_dosificacion_resistencia(df_dos, df_res, filtro_edad=None, fecha_inicio
     
     # --- CORRECCIÓN DE CRUCE ---
     # Normalizamos ambas tablas para tener 'grado_join' = Letra + Numero (ej. G30)
+    # Las columnas auxiliares se agregan con assign (DataFrames nuevos): no se modifican
+    # los DataFrames recibidos ni los filtrados por edad/fecha (vistas de df_res)
     
     # 1. Preparar Dosificaciones
     # Limpiamos parte numérica de resistencia (ej 30.0 -> 30)
-    res_str_dos = df_dos['resistencia'].astype(str).str.replace(r'\.0$', '', regex=True).str.strip()
+    res_str_dos = _limpiar_num(df_dos['resistencia'])
     # Si el grado ya contiene el número (ej G30), lo dejamos. Si es solo G, concatenamos.
     # Heurística: Si grado termina en dígito, ya está listo.
-    df_dos['grado_join'] = df_dos.apply(
-        lambda x: str(x['grado']).strip().upper() if str(x['grado']).strip()[-1].isdigit() 
-        else str(x['grado']).strip().upper() + str(x['resistencia']).replace('.0','').strip(), 
-        axis=1
-    )
+    # (Vectorizado: operaciones .str sobre la columna completa en vez de un apply fila a fila)
+    grado_dos = df_dos['grado'].astype(str).str.strip().str.upper()
+    termina_en_digito = grado_dos.str[-1:].str.isdigit()
+    df_dos = df_dos.assign(grado_join=grado_dos.where(termina_en_digito, grado_dos + res_str_dos))
 
     # 2. Preparar Resistencias
     # Misma lógica: Si Grado es 'G' y existe 'resistencia_mpa', concatenamos?
     # Usualmente en Historial de Resistencias, la columna 'Grado' suele ser el código completo 'G30'.
     # Pero por seguridad, aplicamos limpieza.
-    df_res['grado_join'] = df_res['grado'].astype(str).str.strip().str.upper()
+    df_res = df_res.assign(grado_join=df_res['grado'].astype(str).str.strip().str.upper())
     
-    # Normalización general
-    for col in ['grado_join', 'docilidad']:
-        if col in df_res.columns:
-            df_res[col] = df_res[col].astype(str).str.strip().str.upper()
-        if col in df_dos.columns:
-            df_dos[col] = df_dos[col].astype(str).str.strip().str.upper()
+    # grado_join ya sale normalizado en ambas tablas y 'docilidad' viene en mayúsculas
+    # desde los cargadores (_normalizar); no se repite el strip/upper aquí
 
     # Clave: GRADO_JOIN + FD + TMN + DOCILIDAD
     # Nota: FD y TMN son numéricos/float, los convertimos a string eliminando .0 si son enteros
-    
-    def clean_num(serie):
-        return serie.astype(str).str.replace(r'\.0$', '', regex=True).str.strip()
-
-    df_res['clave_mix'] = (
-        df_res['grado_join'] + "_" + 
-        clean_num(df_res['fraccion_defectuosa']) + "_" + 
-        clean_num(df_res['tmn']) + "_" + 
-        clean_num(df_res['docilidad'])  # Clean docilidad also
+    # (docilidad también); str.cat une las cuatro partes en una sola pasada
+    # Además: resistencia_mpa numérica y fecha_ensayo datetime antes de agregar
+    df_res = df_res.assign(
+        clave_mix=_clave_mix(df_res),
+        resistencia_mpa=pd.to_numeric(df_res['resistencia_mpa'], errors='coerce'),
+        fecha_ensayo=pd.to_datetime(df_res['fecha_ensayo'], errors='coerce')
     )
     
     # Clave en Dosificaciones
-    df_dos['clave_mix'] = (
-        df_dos['grado_join'] + "_" + 
-        clean_num(df_dos['fraccion_defectuosa']) + "_" + 
-        clean_num(df_dos['tmn']) + "_" + 
-        clean_num(df_dos['docilidad'])  # Clean docilidad also
-    )
-    
-    
-    # Asegurar que resistencia_mpa sea numérica antes de agregar
-    df_res['resistencia_mpa'] = pd.to_numeric(df_res['resistencia_mpa'], errors='coerce')
-    
-    # Asegurar que fecha_ensayo sea datetime
-    df_res['fecha_ensayo'] = pd.to_datetime(df_res['fecha_ensayo'], errors='coerce')
+    df_dos = df_dos.assign(clave_mix=_clave_mix(df_dos))
     
     # Calculamos estadísticas por Clave (solo si hay datos válidos)
-    stats = df_res.groupby('clave_mix').agg(
+    # Las claves de las recetas se codifican una vez como enteros (posición en 'claves',
+    # NaN -> -1). Los ensayos se agrupan por una categoría con esas mismas claves: los de
+    # clases sin receta quedan fuera (NaN) antes de agrupar, como los descartaría igual
+    # el INNER join de abajo
+    cod_dos, claves = pd.factorize(df_dos['clave_mix'])
+    clave_cat = pd.Categorical(df_res['clave_mix'], categories=claves)
+    stats = df_res.groupby(clave_cat, observed=True).agg(
         n_muestras=('resistencia_mpa', 'count'),
-        promedio_fc=('resistencia_mpa', lambda x: x.mean() if x.notna().any() else np.nan),
-        desviacion_std=('resistencia_mpa', lambda x: x.std() if x.notna().any() else np.nan),
-        ultimo_ensayo=('fecha_ensayo', lambda x: x.max() if x.notna().any() else pd.NaT)
-    ).reset_index()
+        # mean/std/max ya ignoran NaN/NaT y devuelven NaN/NaT si el grupo no tiene datos válidos
+        promedio_fc=('resistencia_mpa', 'mean'),
+        desviacion_std=('resistencia_mpa', 'std'),
+        ultimo_ensayo=('fecha_ensayo', 'max')
+    )
     
     # Unimos
     # MODIFICADO: Usamos INNER join para que el filtro de fechas en la tabla derecha (stats -> df_res)
     # filtre efectivamente las recetas que se muestran. Si no hay ensayos en la fecha, la receta no sale.
-    df_final = pd.merge(df_dos, stats, on='clave_mix', how='inner')
+    # El cruce usa los códigos enteros (sin volver a hashear strings): fila_stats[código] es la
+    # fila de stats de cada clave, -1 si no tiene ensayos (la posición extra cubre el código -1)
+    fila_stats = np.full(len(claves) + 1, -1)
+    fila_stats[stats.index.codes] = np.arange(len(stats))
+    pos = fila_stats[cod_dos]
+    con_ensayos = pos >= 0
+    df_final = pd.concat([
+        df_dos[con_ensayos].reset_index(drop=True),
+        stats.iloc[pos[con_ensayos]].reset_index(drop=True)
+    ], axis=1)
     
     return df_final
 
+@st.cache_data(ttl=600, show_spinner=False)
+def cruzar_historial(df_dos, df_res, filtro_edad=(), fecha_inicio=None, fecha_fin=None):
+    """
+    Cruce Dosificaciones <-> Resistencias (unir_dosificacion_resistencia) cacheado.
+    Los DataFrames forman parte de la clave de caché (st.cache_data los hashea): el cruce
+    usa exactamente los datos que muestra la página y se recalcula cuando los cargadores
+    traen datos nuevos; los reruns con los mismos filtros reutilizan el cruce ya calculado.
+    
+    Args:
+        df_dos: Dosificaciones (cargar_dosificaciones)
+        df_res: Resistencias (cargar_resistencias)
+        filtro_edad (tuple): Edades (días) a considerar, ordenadas (ej: tuple(sorted(sel)))
+        fecha_inicio (date): Fecha inicial para filtrar ensayos.
+        fecha_fin (date): Fecha final para filtrar ensayos.
+    """
+    return unir_dosificacion_resistencia(
+        df_dos, df_res,
+        filtro_edad=list(filtro_edad),
+        fecha_inicio=fecha_inicio,
+        fecha_fin=fecha_fin
+    )
+
 def obtener_arido_promedio(tipo_material, fecha_desde, fecha_hasta):
     """
     Retorna las propiedades promedio de un árido en un período específico.
@@ -342,9 +403,9 @@ def obtener_arido_promedio(tipo_material, fecha_desde, fecha_hasta):
         return None
     
     # Filtrar por tipo y rango de fechas
-    mask = (df['tipo_material'].str.upper().str.contains(tipo_material.upper(), na=False)) & \
-           (df['fecha_muestreo'] >= fecha_desde) & \
-           (df['fecha_muestreo'] <= fecha_hasta)
+    # (búsqueda literal, sin regex: el nombre viene de la planilla y puede traer "(", "+", ".")
+    mask = (df['tipo_material'].str.upper().str.contains(tipo_material.upper(), na=False, regex=False)) & \
+           _en_rango_fechas(df['fecha_muestreo'], fecha_desde, fecha_hasta)
     
     df_filtrado = df[mask]
     
@@ -360,16 +421,12 @@ def obtener_arido_promedio(tipo_material, fecha_desde, fecha_hasta):
     
     # 1. Convertir columnas críticas a numérico (Coerce errors to NaN)
     cols_claves_fisicas = ['drs', 'drsss', 'absorcion']
-    for col in cols_claves_fisicas:
-        if col in df_filtrado.columns:
-            df_filtrado[col] = pd.to_numeric(df_filtrado[col], errors='coerce')
-
-    # Convertir columnas de tamices a numérico
-    tamices_presentes = []
-    for tamiz in tamices_cols:
-        if tamiz in df_filtrado.columns:
-            df_filtrado[tamiz] = pd.to_numeric(df_filtrado[tamiz], errors='coerce')
-            tamices_presentes.append(tamiz)
+    # Columnas de tamices presentes
+    tamices_presentes = [tamiz for tamiz in tamices_cols if tamiz in df_filtrado.columns]
+    # assign devuelve un DataFrame nuevo (df_filtrado es un filtro de los datos cacheados)
+    cols_convertir = [col for col in cols_claves_fisicas if col in df_filtrado.columns] + tamices_presentes
+    df_filtrado = df_filtrado.assign(**{col: pd.to_numeric(df_filtrado[col], errors='coerce')
+                                        for col in cols_convertir})
             
     # 2. Eliminar filas que tengan CUALQUIER dato faltante en las columnas claves
     # (Granulometría + Densidades + Absorción)
@@ -393,13 +450,9 @@ def obtener_arido_promedio(tipo_material, fecha_desde, fecha_hasta):
 
     # --- CALCULO DE PROMEDIOS CON DATA LIMPIA ---
     
-    # Calcular granulometría promedio (solo tamices que existan)
-    gran_prom = []
-    for tamiz in tamices_cols:
-        if tamiz in df_filtrado.columns:
-            gran_prom.append(df_filtrado[tamiz].mean())
-        else:
-            gran_prom.append(100.0)  # Default si no existe
+    # Calcular granulometría promedio (solo tamices que existan): un solo mean() sobre
+    # el bloque de columnas; los tamices que no existen quedan en 100.0 (default)
+    gran_prom = df_filtrado[tamices_presentes].mean().reindex(tamices_cols, fill_value=100.0).tolist()
     
     # Calcular promedios
     # Calcular promedios de forma segura (0.0 si es NaN)
@@ -416,9 +469,12 @@ def obtener_arido_promedio(tipo_material, fecha_desde, fecha_hasta):
         'absorcion': safe_mean(df_filtrado['absorcion'], 0.0) / 100.0 if 'absorcion' in df_filtrado.columns else 0.0,
         'granulometria': gran_prom,
         'n_muestras': len(df_filtrado),
-        'fecha_ultimo': df_filtrado['fecha_muestreo'].max(),
-        'fecha_primero': df_filtrado['fecha_muestreo'].min(),
-        'muestras_detalle': df_filtrado[['n_muestra', 'fecha_muestreo', 'drs', 'absorcion']].to_dict('records') if len(df_filtrado) <= 50 else []
+        'fecha_ultimo': _a_fecha(df_filtrado['fecha_muestreo'].max()),
+        'fecha_primero': _a_fecha(df_filtrado['fecha_muestreo'].min()),
+        # Detalle por columnas (dict de listas, se muestra con pd.DataFrame): 4 listas en vez de un dict por fila
+        'muestras_detalle': df_filtrado[['n_muestra', 'fecha_muestreo', 'drs', 'absorcion']].assign(
+            fecha_muestreo=df_filtrado['fecha_muestreo'].dt.date
+        ).to_dict('list') if len(df_filtrado) <= 50 else {}
     }
     
     # Corrección porcentaje absorción si la media > 1 (ej. 1.5% vs 0.015)
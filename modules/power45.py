@@ -4,6 +4,7 @@ Implementa el cálculo de la curva ideal Power 45 y métricas de error.
 """
 
 import numpy as np
+from functools import lru_cache
 from typing import List, Tuple, Dict
 import matplotlib.pyplot as plt
 import io
@@ -31,6 +32,23 @@ def calcular_valor_power45(tamiz_mm: float) -> float:
     return tamiz_mm ** 0.45
 
 
+@lru_cache(maxsize=4)
+def calcular_valores_power45(tamices_mm: Tuple[float, ...]) -> Tuple[float, ...]:
+    """
+    Calcula los valores Power 45 de una serie de tamices en una sola operación.
+    
+    Se cachea por serie de tamices (en la práctica, la serie estándar fija).
+    
+    Args:
+        tamices_mm: Tupla de tamaños de tamiz en mm
+    
+    Returns:
+        Tupla con cada tamiz elevado a 0.45 (0 para tamaños no positivos)
+    """
+    tamices = np.clip(np.asarray(tamices_mm, dtype=np.float64), 0.0, None)
+    return tuple(np.power(tamices, 0.45).tolist())
+
+
 def generar_curva_ideal_power45(tmn: float, tamices: List[float] = None) -> Tuple[List[float], List[float]]:
     """
     Genera la curva ideal de gradación Power 45 para un TMN dado.
@@ -246,7 +264,7 @@ def graficar_power45(mezcla_pct: List[float], tmn: float,
     fig, ax = plt.subplots(figsize=(12, 8))
     
     # Eje X en escala Power 45
-    x_valores = [t ** 0.45 for t in tamices]
+    x_valores = calcular_valores_power45(tuple(tamices))
     
     # Curva ideal
     ax.plot(x_valores, ideal, 'b-', linewidth=2, label='Curva Ideal Power 45', marker='s', markersize=6)
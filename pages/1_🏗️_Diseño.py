@@ -192,7 +192,7 @@ with tab3:
             st.markdown("#### Curva Power 0.45")
             
             # Preparar datos power45
-            from modules.power45 import generar_curva_ideal_power45, calcular_error_power45, TAMICES_POWER45
+            from modules.power45 import generar_curva_ideal_power45, calcular_error_power45, calcular_valores_power45, TAMICES_POWER45
             ideal_curve, _ = generar_curva_ideal_power45(tmn=inputs['tmn'])
             real_curve = faury['granulometria_mezcla']
             
@@ -204,7 +204,7 @@ with tab3:
             # TAMICES_ASTM puede tener longitud diferente, ajustar
             nombres = TAMICES_ASTM[:min_len]
             # Calcular valores X elevados a 0.45 como espera el gráfico
-            x_vals = [t**0.45 for t in TAMICES_POWER45[:min_len]]
+            x_vals = calcular_valores_power45(tuple(TAMICES_POWER45[:min_len]))
             
             fig_p45 = crear_grafico_power45_interactivo(
                 tamices_nombres=nombres,
@@ -440,7 +440,7 @@ with tab4:
             
             with tab_p45:
                 # Datos para P45 Optimizado
-                from modules.power45 import TAMICES_POWER45, calcular_error_power45
+                from modules.power45 import TAMICES_POWER45, calcular_error_power45, calcular_valores_power45
                 from modules.graphics import (
                     crear_grafico_power45_interactivo,
                     crear_grafico_tarantula_interactivo, 
@@ -451,7 +451,7 @@ with tab4:
                     crear_grafico_illinois
                 )
                 tamices_astm_nombres = TAMICES_ASTM[:len(res['curva_ideal'])]
-                x_vals_opt = [t**0.45 for t in TAMICES_POWER45[:len(res['curva_ideal'])]]
+                x_vals_opt = calcular_valores_power45(tuple(TAMICES_POWER45[:len(res['curva_ideal'])]))
                 rmse_opt = calcular_error_power45(res['mezcla_granulometria'], res['curva_ideal'])
 
                 fig = crear_grafico_power45_interactivo(
@@ -3,7 +3,9 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from modules.utils_ui import inicializar_estado, sidebar_user_info
-from modules.historical_data import cargar_dosificaciones, cargar_resistencias, unir_dosificacion_resistencia
+from modules.historical_data import (
+    cargar_dosificaciones, cargar_resistencias, cruzar_historial
+)
 
 st.set_page_config(page_title="Análisis Histórico", page_icon="📈", layout="wide")
 
@@ -67,10 +69,10 @@ else:
     if isinstance(periodo, tuple) and len(periodo) == 2:
         fecha_ini, fecha_fin = periodo
         
-    df_final = unir_dosificacion_resistencia(
-        df_dos, 
-        df_res, 
-        filtro_edad=sel_edad,
+    # Cruce cacheado por datos y filtros (no se recalcula al cambiar los filtros específicos)
+    df_final = cruzar_historial(
+        df_dos, df_res,
+        filtro_edad=tuple(sorted(sel_edad)),
         fecha_inicio=fecha_ini,
         fecha_fin=fecha_fin
     )
@@ -203,4 +205,8 @@ with tab2:
     
     if not df_res.empty:
         st.subheader("Resistencias (Raw)")
-        st.dataframe(df_res)
+        # Fechas: datetime64 en los datos, se muestran solo como fecha (sin 00:00:00)
+        st.dataframe(df_res, column_config={
+            col: st.column_config.DateColumn(format="DD/MM/YYYY")
+            for col in ('fecha_confeccion', 'fecha_ensayo')
+        })
@@ -0,0 +1,187 @@
+"""
+Script de prueba para los constructores de gráficos Plotly (modules/graphics.py).
+Prueba:
+1. Franja de métricas HTML: etiquetas y valores escapados, color según el tema.
+2. Contenido de cada gráfico: cantidad de trazas, límites NSW / Illinois / Tarantula,
+   orden de los tamices en el eje X y curva ideal Power 45.
+3. Tipo de traza: todas las curvas de tamices en SVG (scatter).
+4. Tablas Markdown: metacaracteres escapados, números con decimales fijos y banda irregular.
+5. Layouts constantes: construir y modificar figuras no los altera.
+"""
+
+import sys
+import os
+import re
+import copy
+import json
+from unittest import mock
+
+# Agregar directorio raíz
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import plotly.io as pio
+
+from modules import graphics
+from modules.power45 import calcular_valor_power45, generar_curva_ideal_power45
+
+# Datos de ejemplo (13 tamices estándar, TMN 25 mm)
+TAMICES = list(graphics.TAMICES_STD)
+TMN = 25.0
+TAMICES_MM, IDEAL = generar_curva_ideal_power45(TMN)
+TAMICES_POWER = [calcular_valor_power45(t) for t in TAMICES_MM]
+MEZCLA = [100, 100, 95, 85, 70, 60, 45, 35, 25, 17, 10, 5, 2]
+RETENIDOS = [0, 0, 5, 10, 15, 10, 15, 10, 10, 8, 7, 5, 3]
+ARIDOS = [
+    {'nombre': 'Grava 20', 'granulometria': [100, 100, 90, 60, 30, 10, 2, 1, 0, 0, 0, 0, 0]},
+    {'nombre': 'Arena', 'granulometria': [100, 100, 100, 100, 100, 100, 95, 80, 60, 40, 20, 8, 3]}
+]
+
+def _casos():
+    """(constructor, argumentos, cantidad de trazas esperada) de cada gráfico."""
+    return {
+        'shilstone': (graphics.crear_grafico_shilstone_interactivo, (60.0, 35.0, {'zona': 'II'}), 3),
+        'power45': (graphics.crear_grafico_power45_interactivo, (TAMICES, TAMICES_POWER, IDEAL, MEZCLA, 3.2), 3),
+        'nsw': (graphics.crear_grafico_nsw, (TAMICES, MEZCLA), 3),
+        'illinois': (graphics.crear_grafico_illinois, (TAMICES, MEZCLA), 3),
+        'tarantula': (graphics.crear_grafico_tarantula_interactivo, (TAMICES, RETENIDOS, TMN), 2),
+        'individual_combinado': (graphics.crear_grafico_individual_combinado, (TAMICES, ARIDOS, MEZCLA), 5),
+        'haystack': (graphics.crear_grafico_haystack_interactivo, (TAMICES, RETENIDOS), 1),
+        'gradaciones': (graphics.crear_grafico_gradaciones_individuales, (TAMICES, ARIDOS, [60.0, 40.0], MEZCLA), 3),
+        'comparacion': (graphics._crear_grafico_comparacion_power45, (IDEAL[1:], MEZCLA[1:]), 2),
+    }
+
+def _resultados_faury(banda):
+    """Resultados mínimos de un diseño Faury-Joisel para mostrar_resultados_faury."""
+    return {
+        'cemento': {'cantidad': 350.0},
+        'agua_cemento': {'agua_amasado': 180.0, 'razon': 0.514, 'agua_total': 195.0},
+        'aire': {'volumen': 15.0},
+        'cantidades_kg_m3': {'Grava': 1000.0, 'Arena': 800.0},
+        'granulometria_mezcla': [100.0, 87.85714285714286, 70.0],
+        'banda_trabajo': banda
+    }
+
+def _tabla_granulometria(banda):
+    """Filas de la tabla 'Granulometría de la Mezcla' que genera mostrar_resultados_faury."""
+    with mock.patch.object(graphics, 'st') as st:
+        graphics.mostrar_resultados_faury(_resultados_faury(banda))
+    tabla = st.markdown.call_args_list[-1][0][0]
+    return tabla.split("\n")[2:]
+
+def test_graphics():
+    print("🧪 Iniciando pruebas de gráficos...\n")
+
+    # --- PRUEBA 1: Franja de métricas ---
+    print("--- Prueba 1: Métricas HTML ---")
+    franja = graphics._metricas_html([("A/C", "0.450"), ("<b>Aire</b>", "2 & 3 L/m³")])
+    print(franja)
+    assert "<b>" not in franja and "&lt;b&gt;Aire&lt;/b&gt;" in franja
+    assert "2 &amp; 3 L/m³" in franja
+    # Sin colores fijos del tema claro: la etiqueta hereda el color del tema
+    assert "rgba(" not in franja and "color:inherit" in franja
+    print("✅ Métricas escapadas\n")
+
+    # --- PRUEBA 2: Contenido de los gráficos ---
+    print("--- Prueba 2: Trazas, límites y ejes ---")
+    for nombre, (constructor, args, n_trazas) in _casos().items():
+        fig = constructor(*args)
+        assert len(fig.data) == n_trazas, f"{nombre}: {len(fig.data)} trazas, se esperaban {n_trazas}"
+        # Cada llamada entrega una figura nueva (modificarla no altera la caché)
+        original = json.loads(pio.to_json(fig))
+        fig.update_layout(title_text='modificado')
+        assert json.loads(pio.to_json(constructor(*args))) == original, f"{nombre}: la caché fue modificada"
+        print(f"  {nombre}: {n_trazas} trazas OK")
+
+    # Límites NSW / Illinois: superior e inferior tamiz a tamiz
+    for constructor, limites in ((graphics.crear_grafico_nsw, graphics.NSW_LIMITS),
+                                 (graphics.crear_grafico_illinois, graphics.IL_LIMITS)):
+        sup, inf, mezcla = constructor(TAMICES, MEZCLA).data
+        assert np.array_equal(sup.y, [limites[t][1] for t in TAMICES])
+        assert np.array_equal(inf.y, [limites[t][0] for t in TAMICES])
+        assert np.array_equal(mezcla.y, MEZCLA)
+
+    # Tarantula: una traza cerrada (superior ida, inferior vuelta)
+    banda, retenido = graphics.crear_grafico_tarantula_interactivo(TAMICES, RETENIDOS, TMN).data
+    assert list(banda.x) == TAMICES + TAMICES[::-1]
+    assert np.array_equal(banda.y, list(graphics.TARANTULA_SUP) + list(graphics.TARANTULA_INF[::-1]))
+    assert np.array_equal(retenido.y, RETENIDOS)
+
+    # Orden de los tamices en el eje X (categorías fijas, no las que infiere plotly.js)
+    for nombre in ('nsw', 'illinois', 'tarantula', 'individual_combinado', 'haystack', 'gradaciones'):
+        constructor, args, _ = _casos()[nombre]
+        fig = constructor(*args)
+        assert fig.layout.xaxis.type == 'category', nombre
+        assert list(fig.layout.xaxis.categoryarray) == TAMICES, nombre
+        assert list(fig.data[-1].x) == TAMICES, nombre
+
+    # Power 45: curva ideal de generar_curva_ideal_power45 y banda de +-5 %
+    ideal, limites, mezcla = graphics.crear_grafico_power45_interactivo(TAMICES, TAMICES_POWER, IDEAL, MEZCLA, 3.2).data
+    assert np.allclose(ideal.x, TAMICES_POWER) and np.allclose(ideal.y, IDEAL)
+    assert np.allclose(limites.y[:13], np.minimum(np.array(IDEAL) + 5, 100))
+    assert np.allclose(limites.y[13:], np.maximum(np.array(IDEAL) - 5, 0)[::-1])
+    assert list(graphics.crear_grafico_power45_interactivo(TAMICES, TAMICES_POWER, IDEAL, MEZCLA, 3.2).layout.xaxis.ticktext) == TAMICES
+
+    # Comparación: curva ideal cacheada por TMN, sobre los 12 tamices de resultados
+    tamices_mm, curva_ideal = graphics._curva_ideal_power45(TMN)
+    assert list(curva_ideal) == IDEAL and list(tamices_mm) == TAMICES_MM
+    ideal, opt = graphics._crear_grafico_comparacion_power45(curva_ideal[1:], MEZCLA[1:]).data
+    assert np.allclose(ideal.y, IDEAL[1:]) and np.allclose(opt.y, MEZCLA[1:])
+    fig = graphics._crear_grafico_comparacion_power45(curva_ideal[1:], MEZCLA[1:])
+    assert list(fig.layout.xaxis.ticktext) == list(graphics._TAMICES_RESULTADOS)
+    print("✅ Contenido correcto\n")
+
+    # --- PRUEBA 3: Tipo de traza ---
+    print("--- Prueba 3: SVG ---")
+    for nombre, (constructor, args, _) in _casos().items():
+        tipos = {t.type for t in constructor(*args).data}
+        assert tipos == {'scatter'}, f"{nombre}: curvas de tamices deben ser SVG, no {tipos}"
+    print("✅ Tipos de traza correctos\n")
+
+    # --- PRUEBA 4: Tablas Markdown ---
+    print("--- Prueba 4: Tablas Markdown ---")
+    tabla = graphics._tabla_markdown({
+        'Material': ['Grava | 3/4"', 'Arena_fina', None, '$5 *x*'],
+        'Cantidad': ['1.0 kg', '2.0 kg', '3.0 kg', '4.0 kg']
+    })
+    print(tabla)
+    filas = tabla.split("\n")
+    # Cada fila conserva 2 columnas: solo cuentan los '|' sin escapar
+    assert all(len(re.findall(r'(?<!\\)\|', fila)) == 3 for fila in filas)
+    assert filas[2] == '| Grava \\| 3/4" | 1.0 kg |'
+    assert filas[3] == '| Arena\\_fina | 2.0 kg |'
+    assert filas[4] == '|  | 3.0 kg |'
+    assert filas[5] == '| \\$5 \\*x\\* | 4.0 kg |'
+
+    # Granulometría: % pasante y límites con un decimal; banda más corta -> celdas vacías
+    filas = _tabla_granulometria([(95.0, 100.0), (80.24, 90.0)])
+    print("\n".join(filas))
+    assert filas == ['| 1.5" | 100.0 | 95.0 | 100.0 |',
+                     '| 1" | 87.9 | 80.2 | 90.0 |',
+                     '| 3/4" | 70.0 |  |  |']
+    # Banda irregular o con valores faltantes: la tabla se muestra igual
+    filas = _tabla_granulometria([(95.0, 100.0), (80.0,), None])
+    assert filas[1] == '| 1" | 87.9 |  |  |'
+    filas = _tabla_granulometria([(95.0, None), (80.0, 90.0)])
+    assert filas[0] == '| 1.5" | 100.0 | 95.0 |  |'
+    print("✅ Tablas correctas\n")
+
+    # --- PRUEBA 5: Layouts constantes ---
+    print("--- Prueba 5: Layouts constantes ---")
+    constantes = {nombre: copy.deepcopy(dict(valor)) for nombre, valor in vars(graphics).items()
+                  if nombre.startswith(('_LAYOUT_', '_SHILSTONE_LAYOUT'))}
+    for nombre, (constructor, args, _) in _casos().items():
+        fig = constructor(*args)
+        fig.update_layout(title_text='modificado', xaxis_title_text='x', yaxis_range=[0, 1], legend_x=0.5)
+        if fig.layout.annotations:
+            fig.layout.annotations[0].text = 'modificado'
+        # La especificación sin caché comparte los sub-dicts con las constantes
+        trazos, layout = constructor.__wrapped__(*args)
+        graphics._figura(trazos, layout).update_layout(yaxis_title_text='y')
+    for nombre, valor in constantes.items():
+        assert dict(getattr(graphics, nombre)) == valor, f"{nombre} fue modificado"
+    print(f"  {len(constantes)} layouts sin cambios")
+    print("✅ Layouts constantes\n")
+
+if __name__ == "__main__":
+    test_graphics()
@@ -0,0 +1,95 @@
+"""
+Script de prueba para el cruce Dosificaciones <-> Resistencias del análisis histórico.
+Prueba:
+1. Construcción de grado_join (grado con o sin número).
+2. Estadísticas por clase de hormigón (Grado + FD + TMN + Docilidad).
+3. Lectura de fechas de la planilla (dd/mm/aaaa, ISO aaaa-mm-dd, dd-mm-aa).
+"""
+
+import sys
+import os
+import datetime as dt
+from unittest import mock
+
+# Agregar directorio raíz
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from modules.historical_data import unir_dosificacion_resistencia, _parsear_fechas
+
+def test_historical():
+    print("🧪 Iniciando pruebas de cruce histórico...\n")
+
+    # Recetas: 'G' + resistencia debe cruzar igual que 'G30'; un grado vacío no debe fallar
+    df_dos = pd.DataFrame({
+        'codigo': ['R1', 'R2', 'R3'],
+        'grado': ['G30', 'G', ''],
+        'resistencia': [30.0, 25.0, 20.0],
+        'fraccion_defectuosa': [10.0, 10.0, 10.0],
+        'tmn': [20.0, 20.0, 20.0],
+        'docilidad': ['8', '8', '8']
+    })
+    df_res = pd.DataFrame({
+        'grado': ['G30', 'g30 ', 'G25', 'G25', 'G25'],
+        'fraccion_defectuosa': [10.0, 10.0, 10.0, 10.0, 10.0],
+        'tmn': [20.0, 20.0, 20.0, 20.0, 20.0],
+        'docilidad': ['8', '8.0', '8', '8', '8'],
+        'fecha_confeccion': [dt.date(2024, 1, 1)] * 5,
+        'fecha_ensayo': [dt.date(2024, 1, 29), dt.date(2024, 2, 5), dt.date(2024, 1, 29),
+                         dt.date(2024, 3, 1), dt.date(2024, 2, 1)],
+        'resistencia_mpa': [32.0, 34.0, 27.0, 'n/a', np.nan],
+        'edad_dias': [28, 28, 28, 28, 7]
+    })
+
+    # --- PRUEBA 1: Cruce sin filtros ---
+    print("--- Prueba 1: Cruce sin filtros ---")
+    cols_dos, cols_res = list(df_dos.columns), list(df_res.columns)
+    df = unir_dosificacion_resistencia(df_dos, df_res).set_index('codigo')
+    print(df[['grado_join', 'clave_mix', 'n_muestras', 'promedio_fc']])
+
+    assert list(df.index) == ['R1', 'R2'], "Solo las recetas con ensayos deben aparecer"
+    assert df.loc['R1', 'grado_join'] == 'G30'
+    assert df.loc['R2', 'grado_join'] == 'G25'
+    assert df.loc['R1', 'clave_mix'] == 'G30_10_20_8'
+    assert df.loc['R1', 'n_muestras'] == 2
+    assert abs(df.loc['R1', 'promedio_fc'] - 33.0) < 1e-9
+    # Los valores no numéricos no cuentan como muestra
+    assert df.loc['R2', 'n_muestras'] == 1
+    assert np.isnan(df.loc['R2', 'desviacion_std'])
+    assert df.loc['R2', 'ultimo_ensayo'] == pd.Timestamp(2024, 3, 1)
+    # Los DataFrames recibidos (cacheados en la app) no se modifican
+    assert list(df_dos.columns) == cols_dos and list(df_res.columns) == cols_res
+    assert df_res['resistencia_mpa'].iloc[3] == 'n/a'
+    print("✅ Cruce correcto\n")
+
+    # --- PRUEBA 2: Filtro de edad ---
+    print("--- Prueba 2: Filtro de edad (7 días) ---")
+    df = unir_dosificacion_resistencia(df_dos, df_res, filtro_edad=['7'])
+    print(df[['codigo', 'n_muestras']])
+    assert list(df['codigo']) == ['R2']
+    assert df['n_muestras'].iloc[0] == 0
+    print("✅ Filtro correcto\n")
+
+    # --- PRUEBA 3: Fechas de la planilla ---
+    print("--- Prueba 3: Fechas de la planilla ---")
+    fechas = ['03/04/2024', '15/03/2024 13:45', '2024-01-05', '2024-01-05 10:00:00', '05-01-24', '', 'x']
+    with mock.patch('modules.historical_data.st.warning') as aviso:
+        f = _parsear_fechas(pd.Series(fechas, name='fecha_confeccion'))
+    print(f)
+    # Día primero aunque el valor sea ambiguo; la hora se descarta
+    assert f.iloc[0] == pd.Timestamp(2024, 4, 3)
+    assert f.iloc[1] == pd.Timestamp(2024, 3, 15)
+    # ISO (modules/database.py) no se confunde con día primero
+    assert f.iloc[2] == pd.Timestamp(2024, 1, 5)
+    assert f.iloc[3] == pd.Timestamp(2024, 1, 5)
+    assert f.iloc[4] == pd.Timestamp(2024, 1, 5)
+    # Celda vacía: NaT sin aviso; texto que no es fecha: NaT con aviso
+    assert pd.isna(f.iloc[5]) and pd.isna(f.iloc[6])
+    aviso.assert_called_once()
+    assert "1 fecha(s)" in aviso.call_args[0][0]
+    print("✅ Fechas correctas\n")
+
+if __name__ == "__main__":
+    test_historical()